@@ -1,21 +1,34 @@
+import hashlib
+import hmac
+
 from fastapi import Security, HTTPException, status
 from fastapi.security import APIKeyHeader
 from .config import settings
 
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+# Settings are loaded once at import, so bind the digests directly
+_api_key_digests = settings.api_key_digests
+
 
 async def verify_api_key(api_key: str = Security(api_key_header)):
     """Verify the API key from the request header."""
-    valid_keys = settings.get_api_keys()
-    
     if not api_key:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Missing API Key. Please provide X-API-Key header."
         )
     
-    if api_key not in valid_keys:
+    # Compare digests against every key without short-circuiting so the
+    # response time does not reveal how much of a key was correct
+    digest = hashlib.sha256(api_key.encode()).digest()
+    compare_digest = hmac.compare_digest
+    valid = False
+    
+    for key_digest in _api_key_digests:
+        valid |= compare_digest(digest, key_digest)
+    
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid API Key"
@@ -5,18 +5,53 @@ This module provides in-memory caching of stock prices with:
 - Dynamic ticker discovery (no static configuration needed)
 - Automatic periodic refresh of cached prices
 - Configurable TTL and refresh intervals
-- Thread-safe operations
+- Thread-safe operations with lock-free reads
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from collections import OrderedDict
+from datetime import datetime
+from types import MappingProxyType
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, List, Set, Tuple
 import asyncio
+import heapq
 import logging
+import time
 from threading import Lock
+import numpy as np
 import yfinance as yf
 
+from .clock import now_iso
+from .ratelimit import RateLimitExceeded, run_blocking
+from .session import yf_session
+from .yahoo import SPARK_MAX_SYMBOLS, fetch_spark_quotes
+
 logger = logging.getLogger(__name__)
 
+NS_PER_DAY = 86_400 * 1_000_000_000
+
+# Metadata timestamp for "never happened"; older than any real timestamp
+NEVER = np.iinfo(np.int64).min
+
+# Number of spark chunks fetched concurrently during a refresh
+REFRESH_CONCURRENCY = 4
+
+# Minimum time between background refreshes of one stale symbol, so a
+# failing upstream isn't retried on every request for it
+REVALIDATE_BACKOFF_SECONDS = 60
+
+# Number of cache shards, each with its own writer lock (power of two)
+NUM_SHARDS = 16
+_SHARD_MASK = NUM_SHARDS - 1
+
+# Starting capacity of the metadata arrays (doubled as needed)
+_INITIAL_METADATA_CAPACITY = 64
+
+
+def normalize_symbol(symbol: str) -> str:
+    """Upper-case a ticker symbol, skipping the copy when it is already upper case."""
+    return symbol if symbol.isupper() else symbol.upper()
+
 
 class PriceCache:
     """
@@ -26,6 +61,7 @@ class PriceCache:
     - Tracks recently requested tickers dynamically
     - Periodic background refresh of cached prices
     - Configurable TTL for ticker expiration
+    - Optional size bound with least-recently-requested eviction
     - Thread-safe operations
     """
     
@@ -33,7 +69,10 @@ class PriceCache:
         self,
         ttl_days: int = 7,
         refresh_interval_minutes: int = 30,
-        enabled: bool = True
+        enabled: bool = True,
+        max_symbols: int = 0,
+        initial_capacity: int = 0,
+        clock: Callable[[], int] = time.monotonic_ns
     ):
         """
         Initialize the price cache.
@@ -42,34 +81,81 @@ class PriceCache:
             ttl_days: How long to keep a ticker in cache after last request (default: 7 days)
             refresh_interval_minutes: How often to refresh cached prices (default: 30 minutes)
             enabled: Whether caching is enabled (default: True)
+            max_symbols: Maximum number of cached tickers, or 0 for no limit (default: 0);
+                enforced per shard as max_symbols / NUM_SHARDS, rounded up
+            initial_capacity: Expected number of tickers, to size the metadata upfront (default: 0)
+            clock: Monotonic clock in nanoseconds (default: time.monotonic_ns); tests
+                swap it to move time forward
         """
+        self._clock = clock
         self.enabled = enabled
         self.ttl_days = ttl_days
         self.refresh_interval_minutes = refresh_interval_minutes
+        self.max_symbols = max_symbols
         
-        # Cache storage: symbol -> price data
-        self._cache: Dict[str, dict] = {}
+        # The size bound is enforced per shard: adding a ticker to a full
+        # shard evicts that shard's least recently requested ticker
+        self._max_per_shard = -(-max_symbols // NUM_SHARDS) if max_symbols > 0 else 0
         
-        # Metadata: symbol -> {last_requested, last_refreshed}
-        self._metadata: Dict[str, dict] = {}
+        # Cache storage: symbol -> price data, striped over NUM_SHARDS dicts
+        # by symbol hash. Copy-on-write: a shard dict is never mutated once
+        # published, so readers use it without locking and writers publish
+        # a new dict under that shard's lock. Striping lets writers to
+        # different shards proceed in parallel and keeps each copy small.
+        # Entries are read-only views, so they can be handed out uncopied.
+        self._shards: List[Dict[str, Mapping[str, Any]]] = [{} for _ in range(NUM_SHARDS)]
         
-        # Thread safety
-        self._lock = Lock()
+        # Metadata, stored column-wise: symbol i has its last requested and
+        # last refreshed times (monotonic nanoseconds) at index i of the two
+        # arrays, so the TTL sweep is a single vectorized comparison. Times
+        # are only converted to wall-clock datetimes when shown to users.
+        # The arrays start at initial_capacity, so up to that many tickers
+        # are tracked without regrowing them.
+        capacity = max(initial_capacity, _INITIAL_METADATA_CAPACITY)
+        self._syms: List[str] = []
+        self._idx: Dict[str, int] = {}
+        self._last_req = np.full(capacity, NEVER, dtype=np.int64)
+        self._last_ref = np.full(capacity, NEVER, dtype=np.int64)
+        self._wall_offset_ns = time.time_ns() - self._clock()
         
-        # Statistics
-        self._stats = {
-            "hits": 0,
-            "misses": 0,
-            "refreshes": 0,
-            "errors": 0
-        }
+        # Lower bound on every entry's last requested time: request times
+        # only move forward, so while it is within the TTL nothing can have
+        # expired and the refresh sweep is skipped. New entries lower it;
+        # NEVER forces the next sweep, which recomputes it exactly.
+        self._min_last_req_ns = NEVER
+        
+        # Thread safety: each shard lock serializes that shard's writers,
+        # _meta_lock guards metadata and statistics. Lock order is shard
+        # locks (ascending) first, then _meta_lock.
+        self._shard_locks = [Lock() for _ in range(NUM_SHARDS)]
+        self._meta_lock = Lock()
+        
+        # Statistics, maintained incrementally (updated under _meta_lock,
+        # read without locking since a slightly stale snapshot is fine)
+        self._hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._errors = 0
+        self._evictions = 0
+        
+        # In-flight background refreshes of stale entries, by symbol, so a
+        # burst of requests for one stale symbol triggers a single fetch
+        self._revalidating: Dict[str, asyncio.Task] = {}
+        
+        # Monotonic time of the last background refresh attempt, by symbol,
+        # kept while the symbol stays stale (i.e. the attempt failed)
+        self._revalidated_ns: Dict[str, int] = {}
+        self._revalidate_semaphore = asyncio.Semaphore(REFRESH_CONCURRENCY)
+        
+        # Callbacks told which symbols left the cache (see add_removal_listener)
+        self._removal_listeners: List[Callable[[List[str]], None]] = []
         
         logger.info(
-            f"Price cache initialized: enabled={enabled}, "
-            f"ttl={ttl_days} days, refresh_interval={refresh_interval_minutes} mins"
+            "Price cache initialized: enabled=%s, ttl=%s days, refresh_interval=%s mins",
+            enabled, ttl_days, refresh_interval_minutes
         )
     
-    def get(self, symbol: str) -> Optional[dict]:
+    def get(self, symbol: str) -> Optional[Mapping[str, Any]]:
         """
         Get price data from cache.
         
@@ -77,29 +163,188 @@ class PriceCache:
             symbol: Stock ticker symbol
             
         Returns:
-            Cached price data if available and valid, None otherwise
+            Read-only view of the cached price data if available and valid,
+            None otherwise
+        """
+        return self.get_with_staleness(symbol)[0]
+    
+    def get_with_staleness(self, symbol: str) -> Tuple[Optional[Mapping[str, Any]], bool]:
+        """
+        Get price data from cache along with whether it is stale.
+        
+        An entry is stale when it has not been refreshed for longer than the
+        refresh interval (for example because a periodic refresh failed).
+        Stale data is still returned; callers should serve it and call
+        revalidate() to refresh it in the background.
+        
+        Args:
+            symbol: Stock ticker symbol
+            
+        Returns:
+            Tuple of (read-only view of the cached price data or None,
+            whether that data is stale)
         """
         if not self.enabled:
-            return None
+            return None, False
+        
+        symbol = normalize_symbol(symbol)
         
-        symbol = symbol.upper()
+        # Lock-free read of the currently published shard
+        data = self._shards[hash(symbol) & _SHARD_MASK].get(symbol)
+        now_ns = self._clock()
         
-        with self._lock:
-            # Update last requested time
-            if symbol not in self._metadata:
-                self._metadata[symbol] = {}
+        with self._meta_lock:
+            # Update last requested time (known symbols skip the helper call)
+            i = self._idx.get(symbol)
             
-            self._metadata[symbol]["last_requested"] = datetime.now()
+            if i is None:
+                i = self._metadata_index(symbol, now_ns)
             
-            # Check if we have cached data
-            if symbol in self._cache:
-                self._stats["hits"] += 1
-                logger.debug(f"Cache HIT for {symbol}")
-                return self._cache[symbol].copy()
+            self._last_req[i] = now_ns
+            last_refreshed = int(self._last_ref[i])
             
-            self._stats["misses"] += 1
-            logger.debug(f"Cache MISS for {symbol}")
-            return None
+            if data is not None:
+                self._hits += 1
+            else:
+                self._misses += 1
+        
+        if data is not None:
+            logger.debug("Cache HIT for %s", symbol)
+            return data, now_ns - last_refreshed > self._stale_after_ns
+        
+        logger.debug("Cache MISS for %s", symbol)
+        return None, False
+    
+    def get_many(self, symbols: Iterable[str]) -> Dict[str, Mapping[str, Any]]:
+        """
+        Get price data for several symbols from cache at once.
+        
+        Args:
+            symbols: Stock ticker symbols
+            
+        Returns:
+            Mapping of symbol to read-only view of its cached price data,
+            for the symbols that are cached
+        """
+        return self.get_many_with_staleness(symbols)[0]
+    
+    def get_many_with_staleness(
+        self,
+        symbols: Iterable[str]
+    ) -> Tuple[Dict[str, Mapping[str, Any]], List[str]]:
+        """
+        Get price data for several symbols from cache, along with which are stale.
+        
+        Equivalent to calling get_with_staleness() for each distinct symbol,
+        but metadata and statistics are updated under a single lock
+        acquisition.
+        
+        Args:
+            symbols: Stock ticker symbols
+            
+        Returns:
+            Tuple of (mapping of symbol to read-only view of its cached price
+            data for the symbols that are cached, symbols whose data is stale)
+        """
+        if not self.enabled:
+            return {}, []
+        
+        symbols = list(dict.fromkeys(map(normalize_symbol, symbols)))
+        
+        # Lock-free reads of the currently published shards
+        shards = self._shards
+        hits = {}
+        
+        for symbol in symbols:
+            data = shards[hash(symbol) & _SHARD_MASK].get(symbol)
+            
+            if data is not None:
+                hits[symbol] = data
+        
+        now_ns = self._clock()
+        stale = []
+        
+        with self._meta_lock:
+            for symbol in symbols:
+                i = self._idx.get(symbol)
+                
+                if i is None:
+                    i = self._metadata_index(symbol, now_ns)
+                
+                self._last_req[i] = now_ns
+                
+                if symbol in hits and now_ns - int(self._last_ref[i]) > self._stale_after_ns:
+                    stale.append(symbol)
+            
+            self._hits += len(hits)
+            self._misses += len(symbols) - len(hits)
+        
+        logger.debug("Cache lookup for %s symbols: %s hits", len(symbols), len(hits))
+        return hits, stale
+    
+    def revalidate(self, symbol: str) -> None:
+        """
+        Refresh a symbol in the background.
+        
+        Does nothing if a background refresh of the symbol is already in
+        flight, or if the last one failed less than
+        REVALIDATE_BACKOFF_SECONDS ago. Must be called from the event loop.
+        
+        Args:
+            symbol: Stock ticker symbol
+        """
+        self.revalidate_many([symbol])
+    
+    def revalidate_many(self, symbols: Iterable[str]) -> None:
+        """
+        Refresh several symbols in the background, in batched requests.
+        
+        Symbols already being refreshed in the background, or whose last
+        attempt failed less than REVALIDATE_BACKOFF_SECONDS ago, are skipped.
+        The rest are refreshed in spark-sized chunks, so a request with many
+        stale symbols spends one rate limit token per chunk rather than one
+        per symbol. Must be called from the event loop.
+        
+        Args:
+            symbols: Stock ticker symbols
+        """
+        now_ns = self._clock()
+        backoff_ns = REVALIDATE_BACKOFF_SECONDS * 1_000_000_000
+        due = []
+        
+        for symbol in dict.fromkeys(map(normalize_symbol, symbols)):
+            if symbol in self._revalidating:
+                continue
+            
+            last_attempt_ns = self._revalidated_ns.get(symbol)
+            
+            if last_attempt_ns is not None and now_ns - last_attempt_ns < backoff_ns:
+                continue
+            
+            due.append(symbol)
+        
+        for start in range(0, len(due), SPARK_MAX_SYMBOLS):
+            chunk = due[start:start + SPARK_MAX_SYMBOLS]
+            logger.debug("Revalidating stale entries for %s", ", ".join(chunk))
+            task = asyncio.create_task(self._refresh_chunk(chunk, self._revalidate_semaphore))
+            
+            for symbol in chunk:
+                self._revalidated_ns[symbol] = now_ns
+                self._revalidating[symbol] = task
+            
+            task.add_done_callback(lambda task, chunk=chunk: self._revalidated(chunk, task))
+    
+    def _revalidated(self, symbols: List[str], task: asyncio.Task) -> None:
+        """Done callback of a background refresh started by revalidate_many()."""
+        for symbol in symbols:
+            self._revalidating.pop(symbol, None)
+        
+        if task.cancelled() or task.exception() is not None:
+            return
+        
+        # Only failed attempts need remembering, for the backoff
+        for symbol in task.result():
+            self._revalidated_ns.pop(symbol, None)
     
     def set(self, symbol: str, data: dict) -> None:
         """
@@ -112,18 +357,248 @@ class PriceCache:
         if not self.enabled:
             return
         
-        symbol = symbol.upper()
+        symbol = normalize_symbol(symbol)
+        now_ns = self._clock()
+        
+        shard = hash(symbol) & _SHARD_MASK
+        
+        with self._shard_locks[shard]:
+            evicted = self._select_evictions(self._shards[shard], [symbol], incoming_newest=True)
+            
+            self._publish(shard, {symbol: data}, evicted)
+            
+            with self._meta_lock:
+                for symbol_evicted in evicted:
+                    self._remove_metadata(symbol_evicted)
+                
+                self._evictions += len(evicted)
+                
+                i = self._metadata_index(symbol, now_ns)
+                self._last_req[i] = self._last_ref[i] = now_ns
+            
+            if evicted:
+                logger.debug("Evicted %s to make room for %s", ", ".join(evicted), symbol)
+            
+            logger.debug("Cached data for %s", symbol)
+        
+        self._notify_removed(evicted)
+    
+    def set_many(self, items: Mapping[str, dict]) -> None:
+        """
+        Store price data for several symbols in cache.
+        
+        Equivalent to calling set() for each symbol, but each shard touched
+        is copied and published once, under a single lock acquisition.
+        
+        Args:
+            items: Mapping of stock ticker symbol to price data
+        """
+        if not self.enabled or not items:
+            return
+        
+        items = {normalize_symbol(symbol): data for symbol, data in items.items()}
+        now_ns = self._clock()
+        
+        all_evicted: List[str] = []
+        
+        # One lock acquisition per shard touched, in lock order
+        for shard, shard_symbols in sorted(self._group_by_shard(items).items()):
+            with self._shard_locks[shard]:
+                evicted = self._select_evictions(self._shards[shard], shard_symbols, incoming_newest=True)
+                
+                self._publish(shard, {symbol: items[symbol] for symbol in shard_symbols}, evicted)
+                
+                with self._meta_lock:
+                    for symbol in evicted:
+                        self._remove_metadata(symbol)
+                    
+                    self._evictions += len(evicted)
+                    
+                    for symbol in shard_symbols:
+                        i = self._metadata_index(symbol, now_ns)
+                        self._last_req[i] = self._last_ref[i] = now_ns
+            
+            if evicted:
+                logger.debug("Evicted %s to make room", ", ".join(evicted))
+                all_evicted.extend(evicted)
+        
+        logger.debug("Cached data for %s symbols", len(items))
+        self._notify_removed(all_evicted)
+    
+    def _metadata_index(self, symbol: str, last_requested_ns: int = NEVER) -> int:
+        """
+        Get the metadata array index for a symbol, adding it if needed.
+        
+        Must be called with _meta_lock held.
+        
+        Args:
+            symbol: Normalized stock ticker symbol
+            last_requested_ns: Last requested time for a newly added symbol
+        """
+        i = self._idx.get(symbol)
         
-        with self._lock:
-            self._cache[symbol] = data
+        if i is None:
+            i = len(self._syms)
             
-            if symbol not in self._metadata:
-                self._metadata[symbol] = {}
+            if i == len(self._last_req):
+                # Grow both arrays by doubling
+                self._last_req = np.concatenate([self._last_req, np.full(i, NEVER, dtype=np.int64)])
+                self._last_ref = np.concatenate([self._last_ref, np.full(i, NEVER, dtype=np.int64)])
             
-            self._metadata[symbol]["last_refreshed"] = datetime.now()
-            self._metadata[symbol]["last_requested"] = datetime.now()
+            self._syms.append(symbol)
+            self._idx[symbol] = i
+            self._last_req[i] = last_requested_ns
+            self._last_ref[i] = NEVER
+            self._min_last_req_ns = min(self._min_last_req_ns, last_requested_ns)
+        
+        return i
+    
+    def add_removal_listener(self, callback: Callable[[List[str]], None]) -> None:
+        """
+        Register a callback to be told which symbols left the cache.
+        
+        The callback is called with a list of symbols whenever they expire,
+        are evicted, removed or cleared, so that data derived from cache
+        entries can be dropped with them. It may run in any thread, after
+        the cache's locks are released, and should be quick.
+        
+        Args:
+            callback: Function taking the list of removed symbols
+        """
+        self._removal_listeners.append(callback)
+    
+    def _notify_removed(self, symbols: List[str]) -> None:
+        """Tell the removal listeners about removed symbols, if any."""
+        if symbols:
+            for callback in self._removal_listeners:
+                callback(symbols)
+    
+    def _select_evictions(
+        self,
+        current: Mapping[str, Any],
+        incoming: List[str],
+        incoming_newest: bool
+    ) -> List[str]:
+        """
+        Get the symbols to evict so a shard stays within the size bound.
+        
+        Must be called with the shard's lock held, and not with _meta_lock.
+        
+        Args:
+            current: The shard's currently published dict
+            incoming: Symbols about to be published to the shard
+            incoming_newest: Whether the incoming symbols are being requested
+                now (set), so only current entries may be evicted; otherwise
+                (refresh) incoming symbols compete on their last request time
+            
+        Returns:
+            Symbols to evict, which may include incoming symbols unless
+            incoming_newest is set
+        """
+        if not self._max_per_shard:
+            return []
+        
+        added = [symbol for symbol in incoming if symbol not in current]
+        overflow = len(current) + len(added) - self._max_per_shard
+        
+        if overflow <= 0:
+            return []
+        
+        if incoming_newest:
+            incoming_set = set(incoming)
+            candidates = [symbol for symbol in current if symbol not in incoming_set]
+        else:
+            candidates = [*current, *added]
+        
+        with self._meta_lock:
+            return self._least_recently_requested(candidates, overflow)
+    
+    def _least_recently_requested(self, symbols: Iterable[str], count: int = 1) -> List[str]:
+        """
+        Get the symbols that were requested longest ago, oldest first.
+        
+        Must be called with _meta_lock held.
+        """
+        last_req = self._last_req
+        idx = self._idx
+        return heapq.nsmallest(
+            count,
+            symbols,
+            key=lambda symbol: last_req[idx[symbol]] if symbol in idx else NEVER
+        )
+    
+    def _remove_metadata(self, symbol: str) -> None:
+        """
+        Remove a symbol's metadata by moving the last entry into its slot.
+        
+        Must be called with _meta_lock held.
+        """
+        i = self._idx.pop(symbol, None)
+        self._revalidated_ns.pop(symbol, None)
+        
+        if i is None:
+            return
+        
+        last = len(self._syms) - 1
+        
+        if i != last:
+            moved = self._syms[last]
+            self._syms[i] = moved
+            self._idx[moved] = i
+            self._last_req[i] = self._last_req[last]
+            self._last_ref[i] = self._last_ref[last]
+        
+        self._syms.pop()
+    
+    def _publish(
+        self,
+        shard: int,
+        updates: Dict[str, dict],
+        removals: Iterable[str] = ()
+    ) -> None:
+        """
+        Publish a new shard dict with the given changes applied.
+        
+        Must be called with the shard's lock held. The current dict is
+        copied rather than mutated so that concurrent lock-free readers
+        never observe a partially updated shard. Updated entries are copied
+        once and stored as read-only views, so later changes by the caller
+        do not leak in.
+        
+        Args:
+            shard: Index of the shard all symbols belong to
+            updates: Symbols to add or replace
+            removals: Symbols to remove
+        """
+        cache = dict(self._shards[shard])
+        
+        for symbol, data in updates.items():
+            cache[symbol] = MappingProxyType(dict(data))
+        
+        for symbol in removals:
+            cache.pop(symbol, None)
+        
+        self._shards[shard] = cache
+    
+    @staticmethod
+    def _group_by_shard(symbols: Iterable[str]) -> Dict[int, List[str]]:
+        """Group symbols by shard index."""
+        groups: Dict[int, List[str]] = {}
+        
+        for symbol in symbols:
+            groups.setdefault(hash(symbol) & _SHARD_MASK, []).append(symbol)
+        
+        return groups
+    
+    @contextmanager
+    def _all_locks(self) -> Iterator[None]:
+        """Hold every shard lock and the metadata lock, in lock order."""
+        with ExitStack() as stack:
+            for lock in self._shard_locks:
+                stack.enter_context(lock)
             
-            logger.debug(f"Cached data for {symbol}")
+            stack.enter_context(self._meta_lock)
+            yield
     
     def get_symbols_to_refresh(self) -> List[str]:
         """
@@ -135,30 +610,52 @@ class PriceCache:
         if not self.enabled:
             return []
         
-        with self._lock:
-            now = datetime.now()
-            ttl_cutoff = now - timedelta(days=self.ttl_days)
+        with self._meta_lock:
+            ttl_cutoff = self._clock() - self.ttl_days * NS_PER_DAY
             
-            symbols_to_refresh = []
-            expired_symbols = []
+            # Fast path: nothing can have expired, skip the locked sweep
+            if self._min_last_req_ns > ttl_cutoff:
+                return self._syms.copy()
+        
+        expired_symbols: List[str] = []
+        
+        with self._all_locks():
+            now_ns = self._clock()
+            ttl_cutoff = now_ns - self.ttl_days * NS_PER_DAY
             
-            for symbol, metadata in self._metadata.items():
-                last_requested = metadata.get("last_requested")
-                
-                if last_requested and last_requested > ttl_cutoff:
-                    # Symbol is still within TTL, should be refreshed
-                    symbols_to_refresh.append(symbol)
-                else:
-                    # Symbol has expired, mark for removal
-                    expired_symbols.append(symbol)
+            n = len(self._syms)
+            
+            # Symbols still within TTL should be refreshed, the rest expire
+            within_ttl = self._last_req[:n] > ttl_cutoff
+            keep = np.nonzero(within_ttl)[0]
+            expired = np.nonzero(~within_ttl)[0]
+            
+            symbols_to_refresh = [self._syms[i] for i in keep]
             
-            # Clean up expired symbols
-            for symbol in expired_symbols:
-                logger.info(f"Removing expired symbol from cache: {symbol}")
-                self._cache.pop(symbol, None)
-                self._metadata.pop(symbol, None)
+            if len(expired):
+                # Clean up expired symbols, compacting the arrays in one pass
+                expired_symbols = [self._syms[i] for i in expired]
+                
+                for symbol in expired_symbols:
+                    logger.info("Removing expired symbol from cache: %s", symbol)
+                    self._revalidated_ns.pop(symbol, None)
+                
+                kept = len(keep)
+                self._last_req[:kept] = self._last_req[keep]
+                self._last_ref[:kept] = self._last_ref[keep]
+                self._last_req[kept:n] = self._last_ref[kept:n] = NEVER
+                self._syms = symbols_to_refresh.copy()
+                self._idx = {symbol: i for i, symbol in enumerate(self._syms)}
+                
+                for shard, removals in self._group_by_shard(expired_symbols).items():
+                    self._publish(shard, {}, removals)
             
-            return symbols_to_refresh
+            # Every remaining entry was requested after the cutoff; entries
+            # added later are requested no earlier than now
+            self._min_last_req_ns = int(self._last_req[:len(keep)].min()) if len(keep) else now_ns
+        
+        self._notify_removed(expired_symbols)
+        return symbols_to_refresh
     
     async def refresh_all(self) -> None:
         """
@@ -175,41 +672,116 @@ class PriceCache:
             logger.debug("No symbols to refresh")
             return
         
-        logger.info(f"Refreshing {len(symbols)} cached symbols: {', '.join(symbols)}")
+        logger.info("Refreshing %s cached symbols: %s", len(symbols), ", ".join(symbols))
         
-        # Refresh each symbol
-        refreshed_count = 0
-        error_count = 0
+        # Refresh in spark-sized chunks, a few chunks at a time
+        semaphore = asyncio.Semaphore(REFRESH_CONCURRENCY)
+        chunks = [
+            symbols[i:i + SPARK_MAX_SYMBOLS]
+            for i in range(0, len(symbols), SPARK_MAX_SYMBOLS)
+        ]
         
-        for symbol in symbols:
+        results = await asyncio.gather(
+            *(self._refresh_chunk(chunk, semaphore) for chunk in chunks)
+        )
+        
+        refreshed_count = sum(len(refreshed) for refreshed in results)
+        error_count = len(symbols) - refreshed_count
+        
+        logger.info(
+            "Refresh completed: %s successful, %s errors out of %s symbols",
+            refreshed_count, error_count, len(symbols)
+        )
+    
+    async def _refresh_chunk(self, symbols: List[str], semaphore: asyncio.Semaphore) -> List[str]:
+        """
+        Refresh one chunk of symbols and store the results.
+        
+        The chunk is fetched with a single spark request; symbols missing
+        from the response fall back to a per-symbol yfinance lookup. All
+        results are published under one lock acquisition, merged over the
+        cached entries so fields a source does not supply (spark has no
+        market cap or open) keep their last known values. If the Yahoo rate
+        limit is exhausted, no further fallbacks are tried and the symbols
+        not yet refreshed count as failed.
+        
+        Args:
+            symbols: Stock ticker symbols (at most SPARK_MAX_SYMBOLS)
+            semaphore: Bounds how many chunks are fetched concurrently
+            
+        Returns:
+            Symbols successfully refreshed
+        """
+        async with semaphore:
             try:
-                # Fetch fresh data from yfinance
-                data = await self._fetch_fresh_data(symbol)
+                fetched = await fetch_spark_quotes(symbols)
+            except RateLimitExceeded as e:
+                logger.warning("Skipping refresh of %s: %s", ", ".join(symbols), e)
                 
-                if data:
-                    with self._lock:
-                        self._cache[symbol] = data
-                        self._metadata[symbol]["last_refreshed"] = datetime.now()
-                        self._stats["refreshes"] += 1
-                    
-                    refreshed_count += 1
-                    logger.debug(f"Refreshed {symbol}: ${data.get('price')}")
-                else:
-                    error_count += 1
-                    logger.warning(f"Failed to refresh {symbol}: No data returned")
+                with self._meta_lock:
+                    self._errors += len(symbols)
                 
-                # Small delay to avoid rate limiting
-                await asyncio.sleep(0.5)
+                return []
+            
+            for symbol in symbols:
+                if symbol not in fetched:
+                    try:
+                        data = await self._fetch_fresh_data(symbol)
+                    except RateLimitExceeded as e:
+                        # The remaining fallbacks would each wait out the
+                        # timeout and be refused too; count them as failed
+                        logger.warning("Skipping remaining fallbacks in chunk: %s", e)
+                        break
+                    
+                    if data:
+                        fetched[symbol] = data
+        
+        failed = [symbol for symbol in symbols if symbol not in fetched]
+        evicted: Set[str] = set()
+        
+        # One lock acquisition per shard touched, in lock order. Refreshing
+        # can add tickers that were only tracked as misses, so the size
+        # bound applies here too.
+        for shard, shard_symbols in sorted(self._group_by_shard(fetched).items()):
+            with self._shard_locks[shard]:
+                current = self._shards[shard]
+                shard_evicted = self._select_evictions(current, shard_symbols, incoming_newest=False)
+                updates = {
+                    symbol: {**current.get(symbol, {}), **fetched[symbol]}
+                    for symbol in shard_symbols
+                    if symbol not in shard_evicted
+                }
+                self._publish(shard, updates, shard_evicted)
                 
-            except Exception as e:
-                error_count += 1
-                self._stats["errors"] += 1
-                logger.error(f"Error refreshing {symbol}: {str(e)}")
+                if shard_evicted:
+                    with self._meta_lock:
+                        for symbol in shard_evicted:
+                            self._remove_metadata(symbol)
+                        
+                        self._evictions += len(shard_evicted)
+                    
+                    logger.debug("Evicted %s to make room", ", ".join(shard_evicted))
+                    evicted.update(shard_evicted)
         
-        logger.info(
-            f"Refresh completed: {refreshed_count} successful, "
-            f"{error_count} errors out of {len(symbols)} symbols"
-        )
+        with self._meta_lock:
+            now_ns = self._clock()
+            
+            for symbol in fetched:
+                if symbol not in evicted:
+                    self._last_ref[self._metadata_index(symbol)] = now_ns
+            
+            self._refreshes += len(fetched)
+            self._errors += len(failed)
+        
+        self._notify_removed(list(evicted))
+        
+        for symbol, data in fetched.items():
+            logger.debug("Refreshed %s: $%s", symbol, data.get('price'))
+        
+        for symbol in failed:
+            logger.warning("Failed to refresh %s: No data returned", symbol)
+        
+        return list(fetched)
     
     async def _fetch_fresh_data(self, symbol: str) -> Optional[dict]:
         """
@@ -220,64 +792,101 @@ class PriceCache:
             
         Returns:
             Price data dictionary or None if fetch fails
+            
+        Raises:
+            RateLimitExceeded: If the Yahoo rate limit is exhausted
         """
         try:
-            # Run yfinance in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            ticker = await loop.run_in_executor(None, yf.Ticker, symbol)
-            info = await loop.run_in_executor(None, lambda: ticker.info)
-            
-            current_price = info.get('currentPrice') or info.get('regularMarketPrice')
-            
-            if not current_price:
-                return None
-            
-            return {
-                "symbol": symbol,
-                "price": current_price,
-                "currency": info.get('currency'),
-                "change": info.get('regularMarketChange'),
-                "change_percent": info.get('regularMarketChangePercent'),
-                "volume": info.get('volume') or info.get('regularMarketVolume'),
-                "market_cap": info.get('marketCap'),
-                "previous_close": info.get('previousClose') or info.get('regularMarketPreviousClose'),
-                "open": info.get('open') or info.get('regularMarketOpen'),
-                "day_high": info.get('dayHigh') or info.get('regularMarketDayHigh'),
-                "day_low": info.get('dayLow') or info.get('regularMarketDayLow'),
-                "timestamp": datetime.now().isoformat()
-            }
+            # Every fast_info read may hit the network, so the whole lookup
+            # runs in a worker thread
+            return await run_blocking(_fetch_fast_info_quote, symbol)
+        except RateLimitExceeded:
+            raise
         except Exception as e:
-            logger.error(f"Error fetching fresh data for {symbol}: {str(e)}")
+            logger.error("Error fetching fresh data for %s: %s", symbol, e)
             return None
     
+    @property
+    def refresh_interval_minutes(self) -> int:
+        """How often cached prices are refreshed, in minutes."""
+        return self._refresh_interval_minutes
+    
+    @refresh_interval_minutes.setter
+    def refresh_interval_minutes(self, minutes: int) -> None:
+        self._refresh_interval_minutes = minutes
+        
+        # Entries the periodic refresh has missed are stale: they are still
+        # served, but trigger a background refresh. Allowing two intervals
+        # keeps this from racing the periodic refresh itself.
+        self._stale_after_ns = 2 * minutes * 60 * 1_000_000_000
+    
+    @property
+    def cached_count(self) -> int:
+        """Number of cached symbols."""
+        return sum(len(shard) for shard in self._shards)
+    
+    @property
+    def hits(self) -> int:
+        """Number of cache hits since creation or the last reset_stats()."""
+        return self._hits
+    
+    @property
+    def misses(self) -> int:
+        """Number of cache misses since creation or the last reset_stats()."""
+        return self._misses
+    
+    @property
+    def total_refreshes(self) -> int:
+        """Number of successful symbol refreshes since creation or the last reset_stats()."""
+        return self._refreshes
+    
+    @property
+    def evictions(self) -> int:
+        """Number of size-bound evictions since creation or the last reset_stats()."""
+        return self._evictions
+    
     def get_stats(self) -> dict:
         """
         Get cache statistics.
         
+        Constant time and lock-free; use get_symbols() for the list of
+        cached symbols.
+        
         Returns:
             Dictionary with cache statistics
         """
-        with self._lock:
-            total_requests = self._stats["hits"] + self._stats["misses"]
-            hit_rate = (
-                (self._stats["hits"] / total_requests * 100)
-                if total_requests > 0
-                else 0
-            )
-            
-            return {
-                "enabled": self.enabled,
-                "cached_symbols": len(self._cache),
-                "total_requests": total_requests,
-                "cache_hits": self._stats["hits"],
-                "cache_misses": self._stats["misses"],
-                "hit_rate_percent": round(hit_rate, 2),
-                "total_refreshes": self._stats["refreshes"],
-                "refresh_errors": self._stats["errors"],
-                "ttl_days": self.ttl_days,
-                "refresh_interval_minutes": self.refresh_interval_minutes,
-                "symbols": list(self._cache.keys()) if self._cache else []
-            }
+        hits = self._hits
+        misses = self._misses
+        total_requests = hits + misses
+        hit_rate = (
+            (hits / total_requests * 100)
+            if total_requests > 0
+            else 0
+        )
+        
+        return {
+            "enabled": self.enabled,
+            "cached_symbols": self.cached_count,
+            "total_requests": total_requests,
+            "cache_hits": hits,
+            "cache_misses": misses,
+            "hit_rate_percent": round(hit_rate, 2),
+            "total_refreshes": self._refreshes,
+            "refresh_errors": self._errors,
+            "evictions": self._evictions,
+            "max_symbols": self.max_symbols,
+            "ttl_days": self.ttl_days,
+            "refresh_interval_minutes": self.refresh_interval_minutes
+        }
+    
+    def get_symbols(self) -> List[str]:
+        """
+        Get the list of cached symbols.
+        
+        Returns:
+            Cached ticker symbols
+        """
+        return [symbol for shard in self._shards for symbol in shard]
     
     def get_symbol_info(self, symbol: str) -> Optional[dict]:
         """
@@ -289,22 +898,32 @@ class PriceCache:
         Returns:
             Symbol metadata or None if not cached
         """
-        symbol = symbol.upper()
+        symbol = normalize_symbol(symbol)
+        data = self._shards[hash(symbol) & _SHARD_MASK].get(symbol)
         
-        with self._lock:
-            if symbol not in self._cache:
-                return None
-            
-            metadata = self._metadata.get(symbol, {})
-            
-            return {
-                "symbol": symbol,
-                "price": self._cache[symbol].get("price"),
-                "cached": True,
-                "last_requested": metadata.get("last_requested").isoformat() if metadata.get("last_requested") else None,
-                "last_refreshed": metadata.get("last_refreshed").isoformat() if metadata.get("last_refreshed") else None,
-                "data": self._cache[symbol]
-            }
+        if data is None:
+            return None
+        
+        with self._meta_lock:
+            i = self._idx.get(symbol)
+            last_requested = int(self._last_req[i]) if i is not None else NEVER
+            last_refreshed = int(self._last_ref[i]) if i is not None else NEVER
+        
+        return {
+            "symbol": symbol,
+            "price": data.get("price"),
+            "cached": True,
+            "last_requested": self._to_isoformat(last_requested),
+            "last_refreshed": self._to_isoformat(last_refreshed),
+            "data": dict(data)
+        }
+    
+    def _to_isoformat(self, monotonic_ns: int) -> Optional[str]:
+        """Render a monotonic timestamp as a wall-clock ISO 8601 string."""
+        if monotonic_ns == NEVER:
+            return None
+        
+        return datetime.fromtimestamp((monotonic_ns + self._wall_offset_ns) / 1e9).isoformat()
     
     def clear(self) -> int:
         """
@@ -313,12 +932,55 @@ class PriceCache:
         Returns:
             Number of symbols removed
         """
-        with self._lock:
-            count = len(self._cache)
-            self._cache.clear()
-            self._metadata.clear()
-            logger.info(f"Cache cleared: {count} symbols removed")
-            return count
+        with self._all_locks():
+            removed = [symbol for shard in self._shards for symbol in shard]
+            count = len(removed)
+            self._shards = [{} for _ in range(NUM_SHARDS)]
+            self._syms = []
+            self._idx = {}
+            self._last_req.fill(NEVER)
+            self._last_ref.fill(NEVER)
+            self._min_last_req_ns = NEVER
+            self._revalidated_ns.clear()
+            logger.info("Cache cleared: %s symbols removed", count)
+        
+        self._notify_removed(removed)
+        return count
+    
+    @contextmanager
+    def override(self, **settings: Any) -> Iterator["PriceCache"]:
+        """
+        Temporarily change cache settings, restoring them on exit.
+        
+        Cached data is left alone, e.g. ``with cache.override(ttl_days=0):``
+        makes every cached ticker expire at the next refresh sweep.
+        
+        Args:
+            **settings: Settings to change, such as ttl_days or
+                refresh_interval_minutes
+            
+        Returns:
+            Context manager yielding this cache
+        """
+        previous = {name: getattr(self, name) for name in settings}
+        
+        try:
+            for name, value in settings.items():
+                setattr(self, name, value)
+            
+            yield self
+        finally:
+            for name, value in previous.items():
+                setattr(self, name, value)
+    
+    def reset_stats(self) -> None:
+        """Reset the request, refresh and eviction counters to zero."""
+        with self._meta_lock:
+            self._hits = 0
+            self._misses = 0
+            self._refreshes = 0
+            self._errors = 0
+            self._evictions = 0
     
     def remove_symbol(self, symbol: str) -> bool:
         """
@@ -330,16 +992,158 @@ class PriceCache:
         Returns:
             True if symbol was removed, False if not in cache
         """
-        symbol = symbol.upper()
+        symbol = normalize_symbol(symbol)
+        
+        shard = hash(symbol) & _SHARD_MASK
+        
+        with self._shard_locks[shard], self._meta_lock:
+            if symbol not in self._shards[shard]:
+                return False
+            
+            self._publish(shard, {}, [symbol])
+            self._remove_metadata(symbol)
+            logger.info("Removed %s from cache", symbol)
+        
+        self._notify_removed([symbol])
+        return True
+
+
+def _fast_info_value(fast_info: Any, name: str) -> Any:
+    """Read a fast_info field, treating fields Yahoo does not provide as None."""
+    try:
+        return getattr(fast_info, name)
+    except Exception:
+        return None
+
+
+def _fetch_fast_info_quote(symbol: str) -> Optional[dict]:
+    """
+    Fetch price data for a symbol using yfinance's fast_info.
+    
+    fast_info is served from a much smaller endpoint than Ticker.info and
+    covers every field the cache stores. Blocking; run it in a thread.
+    
+    Args:
+        symbol: Stock ticker symbol
+        
+    Returns:
+        Price data dictionary or None if no price is available
+    """
+    fast_info = yf.Ticker(symbol, session=yf_session).fast_info
+    current_price = _fast_info_value(fast_info, "last_price")
+    
+    if not current_price:
+        return None
+    
+    previous_close = _fast_info_value(fast_info, "previous_close")
+    change = None
+    change_percent = None
+    
+    if previous_close:
+        change = current_price - previous_close
+        change_percent = change / previous_close * 100
+    
+    return {
+        "symbol": symbol,
+        "price": current_price,
+        "currency": _fast_info_value(fast_info, "currency"),
+        "change": change,
+        "change_percent": change_percent,
+        "volume": _fast_info_value(fast_info, "last_volume"),
+        "market_cap": _fast_info_value(fast_info, "market_cap"),
+        "previous_close": previous_close,
+        "open": _fast_info_value(fast_info, "open"),
+        "day_high": _fast_info_value(fast_info, "day_high"),
+        "day_low": _fast_info_value(fast_info, "day_low"),
+        "timestamp": now_iso()
+    }
+
+
+class ResponseCache:
+    """
+    Time-based in-memory cache for responses that change rarely.
+    
+    Used for company info and dividends. Unlike PriceCache, entries are
+    not refreshed in the background; they are dropped once older than
+    the TTL and fetched again on the next request. Every entry gets the
+    same TTL, so insertion order is expiry order; set() drops expired
+    entries from the front, which keeps keys that are never read again
+    from piling up. Single dict get/set/pop calls are atomic, so no lock
+    is needed.
+    """
+    
+    def __init__(self, ttl_seconds: int, enabled: bool = True):
+        """
+        Initialize the response cache.
+        
+        Args:
+            ttl_seconds: How long a cached response stays valid
+            enabled: Whether caching is enabled (default: True)
+        """
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
         
-        with self._lock:
-            if symbol in self._cache:
-                self._cache.pop(symbol, None)
-                self._metadata.pop(symbol, None)
-                logger.info(f"Removed {symbol} from cache")
-                return True
+        # key -> (expires_at_ns, value), monotonic nanoseconds, oldest first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached response.
+        
+        Args:
+            key: Cache key (usually the ticker symbol)
             
-            return False
+        Returns:
+            Cached value if present and not expired, None otherwise
+        """
+        if not self.enabled:
+            return None
+        
+        entry = self._entries.get(key)
+        
+        if entry is None:
+            return None
+        
+        if time.monotonic_ns() >= entry[0]:
+            self._entries.pop(key, None)
+            return None
+        
+        return entry[1]
+    
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a response in the cache.
+        
+        Args:
+            key: Cache key (usually the ticker symbol)
+            value: Response to cache
+        """
+        if not self.enabled:
+            return
+        
+        now = time.monotonic_ns()
+        
+        # Drop expired entries from the front; they are the oldest
+        while self._entries:
+            oldest_key, (oldest_expires_at, _) = next(iter(self._entries.items()))
+            if oldest_expires_at > now:
+                break
+            self._entries.pop(oldest_key, None)
+        
+        # Pop first so a re-set key moves to the end and order stays by expiry
+        self._entries.pop(key, None)
+        self._entries[key] = (now + self.ttl_seconds * 1_000_000_000, value)
+    
+    def clear(self) -> int:
+        """
+        Clear all cached responses.
+        
+        Returns:
+            Number of entries removed
+        """
+        count = len(self._entries)
+        self._entries = OrderedDict()
+        return count
 
 
 # Global cache instance
@@ -359,7 +1163,9 @@ def get_cache() -> PriceCache:
 def initialize_cache(
     enabled: bool = True,
     ttl_days: int = 7,
-    refresh_interval_minutes: int = 30
+    refresh_interval_minutes: int = 30,
+    max_symbols: int = 0,
+    initial_capacity: int = 0
 ) -> PriceCache:
     """
     Initialize the global cache instance.
@@ -368,6 +1174,8 @@ def initialize_cache(
         enabled: Whether caching is enabled
         ttl_days: How long to keep tickers in cache
         refresh_interval_minutes: How often to refresh prices
+        max_symbols: Maximum number of cached tickers (0 for no limit)
+        initial_capacity: Expected number of tickers, to size the metadata upfront
         
     Returns:
         Initialized PriceCache instance
@@ -377,7 +1185,9 @@ def initialize_cache(
     _cache_instance = PriceCache(
         enabled=enabled,
         ttl_days=ttl_days,
-        refresh_interval_minutes=refresh_interval_minutes
+        refresh_interval_minutes=refresh_interval_minutes,
+        max_symbols=max_symbols,
+        initial_capacity=initial_capacity
     )
     
     return _cache_instance
@@ -0,0 +1,35 @@
+"""
+Coarse wall-clock timestamps for Pi Finance API
+
+Quotes and health checks are stamped with the current local time. Building
+a datetime and formatting it for every quote is wasted work when many
+quotes are stamped within the same second, so the ISO string is formatted
+at most once per second and shared until the second changes.
+"""
+
+from datetime import datetime
+import time
+
+# (second, ISO string) for the most recently formatted second. Replaced as a
+# single tuple so concurrent readers in worker threads never see a torn pair.
+_current = (-1, "")
+
+
+def now_iso() -> str:
+    """
+    Get the current local time as an ISO 8601 string, to the second.
+    
+    Returns:
+        Timestamp such as ``2024-01-02T15:04:05``
+    """
+    global _current
+    
+    second = int(time.time())
+    cached = _current
+    
+    if cached[0] == second:
+        return cached[1]
+    
+    iso = datetime.fromtimestamp(second).isoformat()
+    _current = (second, iso)
+    return iso
@@ -1,5 +1,12 @@
+from functools import cached_property, lru_cache
+import hashlib
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import FrozenSet, List, Tuple
+
+
+def _split_csv(value: str) -> List[str]:
+    """Split a comma-separated string, stripping each item once and dropping blanks and duplicates."""
+    return list(dict.fromkeys(filter(None, map(str.strip, value.split(",")))))
 
 
 class Settings(BaseSettings):
@@ -19,10 +26,17 @@ class Settings(BaseSettings):
     # Server Settings
     api_port: int = 8080  # Port for the API server
     
+    # Yahoo Finance Settings
+    max_upstream_concurrency: int = 16  # Maximum blocking yfinance calls running at once
+    rate_limit_timeout_seconds: float = 5.0  # Longest a request waits for the Yahoo rate limit before failing
+    
     # Cache Settings
     cache_enabled: bool = True  # Enable price caching
     cache_ttl_days: int = 7  # Keep tickers in cache for 7 days after last request
     cache_refresh_interval_minutes: int = 30  # Refresh cached prices every 30 minutes
+    cache_max_symbols: int = 0  # Maximum cached tickers, enforced per shard (see docs/CACHING.md; 0 = unlimited)
+    info_cache_ttl_hours: int = 24  # Keep company info responses for 24 hours
+    dividends_cache_ttl_hours: int = 24  # Keep dividend history responses for 24 hours
     
     class Config:
         env_file = ".env"
@@ -30,14 +44,35 @@ class Settings(BaseSettings):
     
     def get_api_keys(self) -> List[str]:
         """Parse API keys from comma-separated string."""
-        return [key.strip() for key in self.api_keys.split(",") if key.strip()]
+        return _split_csv(self.api_keys)
     
     def get_cors_origins(self) -> List[str]:
         """Parse CORS origins from comma-separated string."""
         if self.cors_origins == "*":
             return ["*"]
-        return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
+        return _split_csv(self.cors_origins)
+    
+    @cached_property
+    def api_keys_set(self) -> FrozenSet[str]:
+        """Valid API keys, parsed once for constant-time membership checks."""
+        return frozenset(self.get_api_keys())
+    
+    @cached_property
+    def api_key_digests(self) -> Tuple[bytes, ...]:
+        """SHA-256 digests of the valid API keys, for constant-time comparison."""
+        return tuple(hashlib.sha256(key.encode()).digest() for key in self.api_keys_set)
+    
+    @cached_property
+    def cors_origins_list(self) -> List[str]:
+        """Allowed CORS origins, parsed once."""
+        return self.get_cors_origins()
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the application settings, reading the environment and .env only once."""
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
 
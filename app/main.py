@@ -1,16 +1,24 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import List, Optional
+from fastapi.responses import Response
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 import yfinance as yf
-from datetime import datetime
+import numpy as np
 import logging
 import asyncio
+import re
+import hashlib
+import orjson
 
 from .config import settings
+from .clock import now_iso
+from .responses import ORJSONResponse
 from .auth import verify_api_key
-from .models import StockQuote, HistoricalDataRequest, CompanyInfo, ErrorResponse
-from .cache import initialize_cache, get_cache
+from .models import StockQuote, HistoricalDataRequest, CompanyInfo
+from .cache import initialize_cache, get_cache, normalize_symbol, ResponseCache
+from .ratelimit import RateLimitExceeded, run_blocking
+from .session import yf_session
+from .yahoo import fetch_quotes, fetch_spark_quotes, get_http_client, close_http_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO if not settings.debug else logging.DEBUG)
@@ -23,45 +31,306 @@ app = FastAPI(
     description="A simple Yahoo Finance API wrapper for Google Sheets integration",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.get_cors_origins(),
+    allow_origins=settings.cors_origins_list,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    """Answer requests refused by the Yahoo rate limit with a retryable 503."""
+    return ORJSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "60"}
+    )
+
+
+# Caches for responses that change rarely (expire after a TTL, no background refresh)
+info_cache = ResponseCache(
+    ttl_seconds=settings.info_cache_ttl_hours * 3600,
+    enabled=settings.cache_enabled
+)
+dividends_cache = ResponseCache(
+    ttl_seconds=settings.dividends_cache_ttl_hours * 3600,
+    enabled=settings.cache_enabled
+)
+
+# Yahoo ticker symbols: letters, digits and the punctuation used for share
+# classes (BRK.B), indices (^GSPC), currencies (EURUSD=X), crypto (BTC-USD)
+# and company names (M&M.NS)
+SYMBOL_RE = re.compile(r"[A-Z0-9.\-^=&]{1,15}")
+_is_valid_symbol = SYMBOL_RE.fullmatch
+
+# Serialized /quote responses and their ETags by symbol. Cached prices are
+# immutable and replaced on refresh, so a rendering stays valid for as long
+# as it was made from the entry that is currently cached. Renderings are
+# dropped when their symbol leaves the price cache (see _forget_quotes).
+_quote_json: Dict[str, Tuple[Mapping[str, Any], bytes, str]] = {}
+
+
+def _etag(body: bytes) -> str:
+    """Compute a strong ETag for a response body."""
+    return '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+def _serialize_quote(data: Mapping[str, Any]) -> Tuple[bytes, str]:
+    """
+    Serialize price data as a StockQuote response body.
+    
+    Args:
+        data: Price data for one symbol
+        
+    Returns:
+        Tuple of (JSON-encoded StockQuote, its ETag)
+    """
+    body = orjson.dumps(StockQuote(**data).model_dump(mode="json"))
+    return body, _etag(body)
+
+
+def _render_quote(symbol: str, data: Mapping[str, Any]) -> Tuple[bytes, str]:
+    """
+    Get the /quote response body and ETag for a cached price entry.
+    
+    The entry is validated and serialized once, then reused until the cache
+    replaces it.
+    
+    Args:
+        symbol: Stock ticker symbol
+        data: Cached price data for the symbol
+        
+    Returns:
+        Tuple of (JSON-encoded StockQuote, its ETag)
+    """
+    memo = _quote_json.get(symbol)
+    
+    if memo is not None and memo[0] is data:
+        return memo[1], memo[2]
+    
+    body, etag = _serialize_quote(data)
+    _quote_json[symbol] = (data, body, etag)
+    return body, etag
+
+
+def _forget_quotes(symbols: List[str]) -> None:
+    """
+    Drop the /quote renderings of symbols that left the price cache.
+    
+    Args:
+        symbols: Symbols that expired or were evicted, removed or cleared
+    """
+    for symbol in symbols:
+        _quote_json.pop(symbol, None)
+
+
+def _json_response(request: Request, body: bytes, etag: str) -> Response:
+    """
+    Build a JSON response with an ETag, honouring If-None-Match.
+    
+    Clients that send back the ETag of the copy they already have get an
+    empty 304 Not Modified instead of the body.
+    
+    Args:
+        request: The incoming request
+        body: JSON-encoded response body
+        etag: ETag of body
+        
+    Returns:
+        A 304 response if the client's copy is current, otherwise the body
+    """
+    if_none_match = request.headers.get("if-none-match")
+    
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers={"ETag": etag})
+    
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+def _fetch_info_quote(symbol: str) -> Optional[dict]:
+    """
+    Fetch a quote for one symbol from yfinance ``.info``.
+    
+    Fills every StockQuote field, for both /quote and /quotes. This blocks
+    on network I/O, so run it in a worker thread.
+    
+    Args:
+        symbol: Stock ticker symbol
+        
+    Returns:
+        Quote data dictionary or None if no price is available
+    """
+    info = yf.Ticker(symbol, session=yf_session).info
+    current_price = info.get('currentPrice') or info.get('regularMarketPrice')
+    
+    if not current_price:
+        return None
+    
+    return {
+        "symbol": symbol,
+        "price": current_price,
+        "currency": info.get('currency'),
+        "change": info.get('regularMarketChange'),
+        "change_percent": info.get('regularMarketChangePercent'),
+        "volume": info.get('volume') or info.get('regularMarketVolume'),
+        "market_cap": info.get('marketCap'),
+        "previous_close": info.get('previousClose') or info.get('regularMarketPreviousClose'),
+        "open": info.get('open') or info.get('regularMarketOpen'),
+        "day_high": info.get('dayHigh') or info.get('regularMarketDayHigh'),
+        "day_low": info.get('dayLow') or info.get('regularMarketDayLow'),
+        "timestamp": now_iso()
+    }
+
+
+async def _fetch_info_quotes(symbols: List[str]) -> Tuple[Dict[str, dict], Dict[str, str]]:
+    """
+    Fetch quotes for several symbols from yfinance concurrently.
+    
+    Each lookup runs in a worker thread, bounded by the shared upstream
+    concurrency limit.
+    
+    Args:
+        symbols: Stock ticker symbols
+        
+    Returns:
+        Tuple of (quotes by symbol, error messages by symbol). Symbols with
+        no price available appear in neither.
+    """
+    results = await asyncio.gather(
+        *(run_blocking(_fetch_info_quote, symbol) for symbol in symbols),
+        return_exceptions=True
+    )
+    
+    quotes = {}
+    errors = {}
+    
+    for symbol, result in zip(symbols, results):
+        if isinstance(result, Exception):
+            logger.warning("Error fetching %s: %s", symbol, result)
+            errors[symbol] = str(result)
+        elif result:
+            quotes[symbol] = result
+    
+    return quotes, errors
+
+
+# In-flight /quote fetches by symbol, so concurrent misses share one fetch
+_inflight_quotes: Dict[str, asyncio.Task] = {}
+
+
+async def _fetch_quote(symbol: str) -> Optional[dict]:
+    """
+    Fetch a full quote for one symbol and store it in the price cache.
+    
+    Tries Yahoo's quote endpoint first and falls back to yfinance ``.info``.
+    
+    Args:
+        symbol: Stock ticker symbol (normalized)
+        
+    Returns:
+        Quote data dictionary or None if no price is available
+    """
+    quote_data = (await fetch_quotes([symbol])).get(symbol)
+    
+    if quote_data is None:
+        # Fall back to yfinance (blocking, so run in a worker thread)
+        quote_data = await run_blocking(_fetch_info_quote, symbol)
+        
+        if quote_data is None:
+            return None
+    
+    # Store in cache for future requests
+    get_cache().set(symbol, quote_data)
+    
+    return quote_data
+
+
+async def _fetch_quote_once(symbol: str) -> Optional[dict]:
+    """
+    Fetch a full quote, joining a fetch for the same symbol if one is in flight.
+    
+    A burst of requests for an uncached symbol therefore makes one upstream
+    call, and every caller gets its result (or its exception).
+    
+    Args:
+        symbol: Stock ticker symbol (normalized)
+        
+    Returns:
+        Quote data dictionary or None if no price is available
+    """
+    task = _inflight_quotes.get(symbol)
+    
+    if task is None:
+        task = asyncio.create_task(_fetch_quote(symbol))
+        _inflight_quotes[symbol] = task
+        task.add_done_callback(lambda _: _inflight_quotes.pop(symbol, None))
+    
+    # Shield the shared fetch so one caller disconnecting doesn't cancel it for the rest
+    return await asyncio.shield(task)
+
+
 # Background task for cache refresh
 async def refresh_cache_periodically():
-    """Background task to refresh cached prices periodically."""
+    """
+    Background task to refresh cached prices periodically.
+    
+    Refreshes are scheduled against fixed monotonic deadlines rather than a
+    sleep after each refresh, so the time a refresh takes does not push
+    later refreshes back. A refresh that overruns its interval restarts the
+    schedule instead of triggering back-to-back refreshes.
+    """
     cache = get_cache()
+    loop = asyncio.get_running_loop()
+    interval_seconds = settings.cache_refresh_interval_minutes * 60
+    next_run = loop.time() + interval_seconds
     
     while True:
         try:
-            await asyncio.sleep(settings.cache_refresh_interval_minutes * 60)
+            await asyncio.sleep(max(0.0, next_run - loop.time()))
             logger.info("Starting periodic cache refresh")
             await cache.refresh_all()
         except Exception as e:
-            logger.error(f"Error in cache refresh task: {str(e)}")
+            logger.error("Error in cache refresh task: %s", e)
+        
+        next_run += interval_seconds
+        
+        if next_run < loop.time():
+            # The refresh overran its slot; restart the schedule from now
+            next_run = loop.time() + interval_seconds
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize cache and start background refresh task."""
+    """Initialize cache, open shared HTTP connections and start background refresh task."""
+    # Open the shared Yahoo HTTP client up front so the first request doesn't pay for it
+    get_http_client()
+    
     # Initialize cache
-    initialize_cache(
+    cache = initialize_cache(
         enabled=settings.cache_enabled,
         ttl_days=settings.cache_ttl_days,
-        refresh_interval_minutes=settings.cache_refresh_interval_minutes
+        refresh_interval_minutes=settings.cache_refresh_interval_minutes,
+        max_symbols=settings.cache_max_symbols,
+        # A bounded cache tracks about that many tickers; size for them upfront
+        initial_capacity=settings.cache_max_symbols
     )
+    cache.add_removal_listener(_forget_quotes)
     
     logger.info(
-        f"Cache initialized: enabled={settings.cache_enabled}, "
-        f"TTL={settings.cache_ttl_days} days, "
-        f"refresh interval={settings.cache_refresh_interval_minutes} minutes"
+        "Cache initialized: enabled=%s, TTL=%s days, refresh interval=%s minutes, max symbols=%s",
+        settings.cache_enabled,
+        settings.cache_ttl_days,
+        settings.cache_refresh_interval_minutes,
+        settings.cache_max_symbols or "unlimited"
     )
     
     # Start background refresh task
@@ -70,29 +339,50 @@ async def startup_event():
         logger.info("Background cache refresh task started")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release shared HTTP connections."""
+    await close_http_client()
+
+
+# The root payload never changes, so it is serialized once
+_ROOT_BODY = orjson.dumps({
+    "name": settings.app_name,
+    "version": settings.app_version,
+    "status": "running",
+    "docs": "/docs",
+    "authentication": "Required - Use X-API-Key header"
+})
+
+# Last /health body and the timestamp it was rendered for
+_health = ("", b"")
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
-    return {
-        "name": settings.app_name,
-        "version": settings.app_version,
-        "status": "running",
-        "docs": "/docs",
-        "authentication": "Required - Use X-API-Key header"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint (no authentication required)."""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat()
-    }
+    global _health
+    
+    # Timestamps change once per second, so re-render at most that often
+    timestamp = now_iso()
+    
+    if _health[0] != timestamp:
+        _health = (timestamp, orjson.dumps({
+            "status": "healthy",
+            "timestamp": timestamp
+        }))
+    
+    return Response(content=_health[1], media_type="application/json")
 
 
 @app.get("/quote/{symbol}", response_model=StockQuote, dependencies=[Depends(verify_api_key)])
-async def get_quote(symbol: str):
+async def get_quote(symbol: str, request: Request):
     """
     Get current quote for a stock symbol.
     
@@ -103,57 +393,42 @@ async def get_quote(symbol: str):
     """
     try:
         cache = get_cache()
-        symbol_upper = symbol.upper()
+        symbol_upper = normalize_symbol(symbol)
         
-        # Try to get from cache first
-        cached_data = cache.get(symbol_upper)
+        # Try to get from cache first; stale data is served while it refreshes
+        cached_data, stale = cache.get_with_staleness(symbol_upper)
         
         if cached_data:
-            logger.debug(f"Returning cached data for {symbol_upper}")
-            return StockQuote(**cached_data)
-        
-        # Cache miss - fetch from yfinance
-        logger.info(f"Cache miss for {symbol_upper}, fetching from Yahoo Finance")
-        ticker = yf.Ticker(symbol_upper)
-        info = ticker.info
+            if stale:
+                cache.revalidate(symbol_upper)
+            
+            logger.debug("Returning cached data for %s", symbol_upper)
+            # Return the pre-rendered body, skipping validation and serialization
+            return _json_response(request, *_render_quote(symbol_upper, cached_data))
         
-        # Get the current price
-        current_price = info.get('currentPrice') or info.get('regularMarketPrice')
+        # Cache miss - fetch from Yahoo, sharing any fetch already in flight
+        logger.info("Cache miss for %s, fetching from Yahoo Finance", symbol_upper)
+        quote_data = await _fetch_quote_once(symbol_upper)
         
-        if not current_price:
+        if quote_data is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"No data found for symbol: {symbol}"
             )
         
-        quote_data = {
-            "symbol": symbol_upper,
-            "price": current_price,
-            "currency": info.get('currency'),
-            "change": info.get('regularMarketChange'),
-            "change_percent": info.get('regularMarketChangePercent'),
-            "volume": info.get('volume') or info.get('regularMarketVolume'),
-            "market_cap": info.get('marketCap'),
-            "previous_close": info.get('previousClose') or info.get('regularMarketPreviousClose'),
-            "open": info.get('open') or info.get('regularMarketOpen'),
-            "day_high": info.get('dayHigh') or info.get('regularMarketDayHigh'),
-            "day_low": info.get('dayLow') or info.get('regularMarketDayLow'),
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        # Store in cache for future requests
-        cache.set(symbol_upper, quote_data)
-        
-        return StockQuote(**quote_data)
-    except HTTPException:
+        return _json_response(request, *_serialize_quote(quote_data))
+    except (HTTPException, RateLimitExceeded):
         raise
     except Exception as e:
-        logger.error(f"Error fetching quote for {symbol}: {str(e)}")
+        logger.error("Error fetching quote for %s: %s", symbol, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/quotes", dependencies=[Depends(verify_api_key)])
-async def get_multiple_quotes(symbols: str = Query(..., description="Comma-separated list of symbols")):
+async def get_multiple_quotes(
+    request: Request,
+    symbols: str = Query(..., description="Comma-separated list of symbols")
+):
     """
     Get quotes for multiple stock symbols.
     
@@ -162,7 +437,7 @@ async def get_multiple_quotes(symbols: str = Query(..., description="Comma-separ
     Note: This endpoint uses caching for improved performance.
     """
     try:
-        symbol_list = [s.strip().upper() for s in symbols.split(",") if s.strip()]
+        symbol_list = [normalize_symbol(s.strip()) for s in symbols.split(",") if s.strip()]
         
         if not symbol_list:
             raise HTTPException(status_code=400, detail="No symbols provided")
@@ -170,65 +445,71 @@ async def get_multiple_quotes(symbols: str = Query(..., description="Comma-separ
         if len(symbol_list) > 50:
             raise HTTPException(status_code=400, detail="Maximum 50 symbols allowed")
         
+        # Reject malformed symbols up front instead of spending upstream requests on them
+        invalid = {symbol for symbol in symbol_list if not _is_valid_symbol(symbol)}
+        
+        valid = [symbol for symbol in symbol_list if symbol not in invalid] if invalid else symbol_list
+        
         cache = get_cache()
+        
+        # Serve what we can from cache; stale data is served while it refreshes
+        cached, stale = cache.get_many_with_staleness(valid)
+        
+        if stale:
+            cache.revalidate_many(stale)
+        
+        missing = [symbol for symbol in dict.fromkeys(valid) if symbol not in cached]
+        
+        try:
+            # Fetch all cache misses in batched spark requests
+            fetched = await fetch_spark_quotes(missing) if missing else {}
+        except RateLimitExceeded as e:
+            # Still answer with what is cached; the misses can't be fetched now
+            fetched = {}
+            errors = dict.fromkeys(missing, str(e))
+        else:
+            # Look up anything the batch response lacked concurrently via yfinance
+            fallback = [symbol for symbol in missing if symbol not in fetched]
+            fallback_quotes, errors = await _fetch_info_quotes(fallback) if fallback else ({}, {})
+            fetched.update(fallback_quotes)
+        
+        errors.update(dict.fromkeys(invalid, "Invalid symbol"))
+        
+        # Store in cache
+        cache.set_many(fetched)
+        
         results = []
         
         for symbol in symbol_list:
-            try:
-                # Try cache first
-                cached_data = cache.get(symbol)
-                
-                if cached_data:
+            if symbol in cached:
+                quote_data = cached[symbol]
+            elif symbol in fetched:
+                quote_data = fetched[symbol]
+            else:
+                if symbol in errors:
                     results.append({
                         "symbol": symbol,
-                        "price": cached_data.get("price"),
-                        "currency": cached_data.get("currency"),
-                        "change": cached_data.get("change"),
-                        "change_percent": cached_data.get("change_percent"),
-                        "volume": cached_data.get("volume"),
-                        "cached": True
+                        "error": errors[symbol]
                     })
-                else:
-                    # Cache miss - fetch from yfinance
-                    ticker = yf.Ticker(symbol)
-                    info = ticker.info
-                    current_price = info.get('currentPrice') or info.get('regularMarketPrice')
-                    
-                    if current_price:
-                        quote_data = {
-                            "symbol": symbol,
-                            "price": current_price,
-                            "currency": info.get('currency'),
-                            "change": info.get('regularMarketChange'),
-                            "change_percent": info.get('regularMarketChangePercent'),
-                            "volume": info.get('volume') or info.get('regularMarketVolume'),
-                            "timestamp": datetime.now().isoformat()
-                        }
-                        
-                        # Store in cache
-                        cache.set(symbol, quote_data)
-                        
-                        results.append({
-                            "symbol": symbol,
-                            "price": current_price,
-                            "currency": info.get('currency'),
-                            "change": info.get('regularMarketChange'),
-                            "change_percent": info.get('regularMarketChangePercent'),
-                            "volume": info.get('volume') or info.get('regularMarketVolume'),
-                            "cached": False
-                        })
-            except Exception as e:
-                logger.warning(f"Error fetching {symbol}: {str(e)}")
-                results.append({
-                    "symbol": symbol,
-                    "error": str(e)
-                })
+                continue
+            
+            results.append({
+                "symbol": symbol,
+                "price": quote_data.get("price"),
+                "currency": quote_data.get("currency"),
+                "change": quote_data.get("change"),
+                "change_percent": quote_data.get("change_percent"),
+                "volume": quote_data.get("volume"),
+                "cached": symbol in cached
+            })
         
-        return {"quotes": results, "count": len(results)}
-    except HTTPException:
+        # Serialize directly to skip FastAPI's jsonable_encoder pass
+        body = orjson.dumps({"quotes": results, "count": len(results)})
+        return _json_response(request, body, _etag(body))
+    except (HTTPException, RateLimitExceeded):
         raise
     except Exception as e:
-        logger.error(f"Error fetching multiple quotes: {str(e)}")
+        logger.error("Error fetching multiple quotes: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -242,8 +523,10 @@ async def get_historical_data(request: HistoricalDataRequest):
     - **interval**: Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
     """
     try:
-        ticker = yf.Ticker(request.symbol.upper())
-        hist = ticker.history(period=request.period, interval=request.interval)
+        symbol_upper = normalize_symbol(request.symbol)
+        # yfinance blocks on network I/O, so run it in a worker thread
+        ticker = yf.Ticker(symbol_upper, session=yf_session)
+        hist = await run_blocking(ticker.history, period=request.period, interval=request.interval)
         
         if hist.empty:
             raise HTTPException(
@@ -251,28 +534,30 @@ async def get_historical_data(request: HistoricalDataRequest):
                 detail=f"No historical data found for {request.symbol}"
             )
         
-        # Convert to dict with date as string
-        data = []
-        for date, row in hist.iterrows():
-            data.append({
-                "date": date.strftime("%Y-%m-%d %H:%M:%S"),
-                "open": float(row['Open']) if not pd.isna(row['Open']) else None,
-                "high": float(row['High']) if not pd.isna(row['High']) else None,
-                "low": float(row['Low']) if not pd.isna(row['Low']) else None,
-                "close": float(row['Close']) if not pd.isna(row['Close']) else None,
-                "volume": int(row['Volume']) if not pd.isna(row['Volume']) else None,
-            })
+        # Convert to dict with date as string (vectorized, NaN -> None)
+        df = hist[['Open', 'High', 'Low', 'Close', 'Volume']].rename(columns=str.lower)
+        df['volume'] = np.trunc(df['volume']).astype('Int64')
+        null_rows = np.flatnonzero(df.isna().any(axis=1).to_numpy())
+        df = df.astype(object).where(df.notna(), None)
+        df.insert(0, 'date', hist.index.strftime("%Y-%m-%d %H:%M:%S"))
+        data = df.to_dict(orient='records')
         
-        return {
-            "symbol": request.symbol.upper(),
+        # Omit missing fields instead of sending nulls; only rows that
+        # actually contain gaps need rewriting
+        for i in null_rows:
+            data[i] = {k: v for k, v in data[i].items() if v is not None}
+        
+        # Return the response directly to skip FastAPI's jsonable_encoder pass
+        return ORJSONResponse({
+            "symbol": symbol_upper,
             "period": request.period,
             "interval": request.interval,
             "data": data
-        }
-    except HTTPException:
+        })
+    except (HTTPException, RateLimitExceeded):
         raise
     except Exception as e:
-        logger.error(f"Error fetching historical data for {request.symbol}: {str(e)}")
+        logger.error("Error fetching historical data for %s: %s", request.symbol, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -282,10 +567,18 @@ async def get_company_info(symbol: str):
     Get company information for a stock symbol.
     
     - **symbol**: Stock ticker symbol (e.g., AAPL, MSFT, GOOGL)
+    
+    Note: Responses are cached (24 hours by default).
     """
     try:
-        ticker = yf.Ticker(symbol.upper())
-        info = ticker.info
+        symbol_upper = normalize_symbol(symbol)
+        cached_info = info_cache.get(symbol_upper)
+        
+        if cached_info:
+            return cached_info
+        
+        ticker = yf.Ticker(symbol_upper, session=yf_session)
+        info = await run_blocking(lambda: ticker.info)
         
         if not info or len(info) < 3:
             raise HTTPException(
@@ -293,8 +586,8 @@ async def get_company_info(symbol: str):
                 detail=f"No company info found for symbol: {symbol}"
             )
         
-        return CompanyInfo(
-            symbol=symbol.upper(),
+        company_info = CompanyInfo(
+            symbol=symbol_upper,
             name=info.get('longName') or info.get('shortName'),
             sector=info.get('sector'),
             industry=info.get('industry'),
@@ -304,10 +597,14 @@ async def get_company_info(symbol: str):
             employees=info.get('fullTimeEmployees'),
             market_cap=info.get('marketCap'),
         )
-    except HTTPException:
+        
+        info_cache.set(symbol_upper, company_info)
+        
+        return company_info
+    except (HTTPException, RateLimitExceeded):
         raise
     except Exception as e:
-        logger.error(f"Error fetching company info for {symbol}: {str(e)}")
+        logger.error("Error fetching company info for %s: %s", symbol, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -318,34 +615,48 @@ async def get_dividends(symbol: str, period: str = Query(default="1y", descripti
     
     - **symbol**: Stock ticker symbol
     - **period**: Time period for dividend history
+    
+    Note: Responses are cached (24 hours by default).
     """
     try:
-        ticker = yf.Ticker(symbol.upper())
-        dividends = ticker.dividends
+        symbol_upper = normalize_symbol(symbol)
+        
+        # The dividend list is cached rather than the response, since the
+        # response echoes the requested period
+        div_data = dividends_cache.get(symbol_upper)
         
-        if dividends.empty:
+        if div_data is None:
+            ticker = yf.Ticker(symbol_upper, session=yf_session)
+            dividends = await run_blocking(lambda: ticker.dividends)
+            
+            # Filter by period if needed
+            # Convert to list of dicts
+            div_data = []
+            for date, value in dividends.items():
+                div_data.append({
+                    "date": date.strftime("%Y-%m-%d"),
+                    "amount": float(value)
+                })
+            
+            div_data = div_data[-100:]  # Limit to last 100 dividends
+            dividends_cache.set(symbol_upper, div_data)
+        
+        if not div_data:
             return {
-                "symbol": symbol.upper(),
+                "symbol": symbol_upper,
                 "period": period,
                 "dividends": [],
                 "message": "No dividend data available"
             }
         
-        # Filter by period if needed
-        # Convert to list of dicts
-        div_data = []
-        for date, value in dividends.items():
-            div_data.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "amount": float(value)
-            })
-        
         return {
-            "symbol": symbol.upper(),
-            "dividends": div_data[-100:]  # Limit to last 100 dividends
+            "symbol": symbol_upper,
+            "dividends": div_data
         }
+    except RateLimitExceeded:
+        raise
     except Exception as e:
-        logger.error(f"Error fetching dividends for {symbol}: {str(e)}")
+        logger.error("Error fetching dividends for %s: %s", symbol, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -362,14 +673,29 @@ async def get_cache_stats():
     - Cache hit/miss rates
     - Number of cached symbols
     - Cache configuration
-    - List of cached symbols
+    
+    Use /cache/symbols for the list of cached symbols.
     """
     try:
         cache = get_cache()
         stats = cache.get_stats()
         return stats
     except Exception as e:
-        logger.error(f"Error getting cache stats: {str(e)}")
+        logger.error("Error getting cache stats: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/cache/symbols", dependencies=[Depends(verify_api_key)])
+async def get_cached_symbols():
+    """
+    Get the list of cached symbols.
+    """
+    try:
+        cache = get_cache()
+        symbols = cache.get_symbols()
+        return {"symbols": symbols, "count": len(symbols)}
+    except Exception as e:
+        logger.error("Error getting cached symbols: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -384,7 +710,7 @@ async def get_cached_symbol_info(symbol: str):
     """
     try:
         cache = get_cache()
-        info = cache.get_symbol_info(symbol.upper())
+        info = cache.get_symbol_info(symbol)
         
         if not info:
             raise HTTPException(
@@ -396,7 +722,7 @@ async def get_cached_symbol_info(symbol: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting symbol info for {symbol}: {str(e)}")
+        logger.error("Error getting symbol info for %s: %s", symbol, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -428,7 +754,7 @@ async def trigger_cache_refresh():
             "symbols": symbols
         }
     except Exception as e:
-        logger.error(f"Error triggering cache refresh: {str(e)}")
+        logger.error("Error triggering cache refresh: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -442,13 +768,15 @@ async def clear_cache():
     try:
         cache = get_cache()
         count = cache.clear()
+        info_cache.clear()
+        dividends_cache.clear()
         
         return {
             "message": "Cache cleared successfully",
             "symbols_removed": count
         }
     except Exception as e:
-        logger.error(f"Error clearing cache: {str(e)}")
+        logger.error("Error clearing cache: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -463,7 +791,7 @@ async def remove_symbol_from_cache(symbol: str):
     """
     try:
         cache = get_cache()
-        removed = cache.remove_symbol(symbol.upper())
+        removed = cache.remove_symbol(symbol)
         
         if not removed:
             raise HTTPException(
@@ -472,19 +800,15 @@ async def remove_symbol_from_cache(symbol: str):
             )
         
         return {
-            "message": f"Symbol {symbol.upper()} removed from cache"
+            "message": f"Symbol {normalize_symbol(symbol)} removed from cache"
         }
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error removing symbol from cache: {str(e)}")
+        logger.error("Error removing symbol from cache: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# Import pandas for historical data processing
-import pandas as pd
-
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,118 @@
+"""
+Shared Yahoo Finance rate limiter for Pi Finance API
+
+Every request to Yahoo, whether made by yfinance or by the batched spark
+client, draws from the same token bucket. Background refreshes and user
+traffic therefore share one budget instead of pacing themselves
+independently, and nothing sleeps while tokens are available. A request
+waits at most ``rate_limit_timeout_seconds`` for a token, then fails with
+RateLimitExceeded rather than queueing for as long as the budget is spent.
+
+Blocking yfinance calls additionally run through run_blocking(), which
+bounds how many occupy worker threads at once, so a burst of requests
+queues on the event loop instead of flooding the thread pool.
+"""
+
+from typing import Any, Callable, TypeVar
+import asyncio
+import threading
+
+from pyrate_limiter import Duration, Limiter, Rate
+
+from .config import settings
+
+T = TypeVar("T")
+
+# Yahoo starts returning 429s well before these limits are publicised,
+# so stay conservative
+YAHOO_RATES = [
+    Rate(60, Duration.MINUTE),
+    Rate(360, Duration.HOUR),
+]
+
+# Bucket name shared by all Yahoo requests
+YAHOO_BUCKET = "yahoo"
+
+yahoo_limiter = Limiter(YAHOO_RATES)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when no Yahoo request may be made within the rate limit timeout."""
+    
+    def __init__(self):
+        super().__init__("Yahoo Finance rate limit exceeded, try again later")
+
+
+# Per worker thread: whether a request in the current run_blocking() call
+# was refused. yfinance catches some request errors and carries on with
+# no data, so the refusal is also recorded here instead of only raised.
+_thread_state = threading.local()
+
+
+def acquire() -> None:
+    """
+    Block the calling thread until a Yahoo request may be made.
+    
+    Raises:
+        RateLimitExceeded: If no request may be made within the timeout
+    """
+    if not yahoo_limiter.try_acquire(YAHOO_BUCKET, timeout=settings.rate_limit_timeout_seconds):
+        _thread_state.refused = True
+        raise RateLimitExceeded()
+
+
+async def acquire_async() -> None:
+    """
+    Wait, without blocking the event loop, until a Yahoo request may be made.
+    
+    Raises:
+        RateLimitExceeded: If no request may be made within the timeout
+    """
+    if not await yahoo_limiter.try_acquire_async(YAHOO_BUCKET, timeout=settings.rate_limit_timeout_seconds):
+        raise RateLimitExceeded()
+
+
+# Blocking yfinance calls allowed in worker threads at once, across all requests
+upstream_semaphore = asyncio.Semaphore(settings.max_upstream_concurrency)
+
+
+def _call_limited(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Call func, raising RateLimitExceeded if any of its requests was refused."""
+    _thread_state.refused = False
+    
+    try:
+        result = func(*args, **kwargs)
+    except RateLimitExceeded:
+        raise
+    except Exception as e:
+        if _thread_state.refused:
+            raise RateLimitExceeded() from e
+        raise
+    
+    if _thread_state.refused:
+        raise RateLimitExceeded()
+    
+    return result
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking Yahoo Finance call in a worker thread.
+    
+    Waits for a free upstream slot first, so at most
+    ``max_upstream_concurrency`` such calls run at once.
+    
+    Args:
+        func: Blocking callable to run
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+        
+    Returns:
+        The return value of func
+        
+    Raises:
+        RateLimitExceeded: If a request made by func was refused by the
+            rate limiter, even if func itself carried on without it
+    """
+    async with upstream_semaphore:
+        return await asyncio.to_thread(_call_limited, func, *args, **kwargs)
@@ -0,0 +1,24 @@
+"""
+Response classes for Pi Finance API
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response serialized with orjson.
+    
+    orjson is a native serializer that is several times faster than the
+    standard library on large numeric payloads such as /history, and
+    handles NumPy scalars and arrays directly.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
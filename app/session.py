@@ -0,0 +1,27 @@
+"""
+Shared yfinance session for Pi Finance API
+
+All yfinance calls go through a single HTTP session so that connections
+and Yahoo's cookie/crumb are reused, and so that every call counts
+against the shared Yahoo rate limit (see ratelimit.py) instead of bursting
+into 429 errors.
+
+Responses are not cached at the HTTP level: yfinance refuses caching
+sessions, and the in-memory PriceCache already covers repeated lookups.
+"""
+
+from curl_cffi import requests as curl_requests
+
+from .ratelimit import acquire
+
+
+class LimiterSession(curl_requests.Session):
+    """curl_cffi session that waits for the shared rate limit before each request."""
+
+    def request(self, method, url, *args, **kwargs):
+        acquire()
+        return super().request(method, url, *args, **kwargs)
+
+
+# yfinance impersonates Chrome by default; keep that when supplying our own session
+yf_session = LimiterSession(impersonate="chrome")
@@ -0,0 +1,277 @@
+"""
+Direct Yahoo Finance HTTP access for Pi Finance API
+
+yfinance issues one request per ticker. For price lookups across many
+symbols we instead call Yahoo's spark endpoint, which accepts up to
+20 symbols per request, over a single shared keep-alive HTTP/2 client.
+Full single quotes come from the v7 quote endpoint, which returns only
+quote fields rather than the dozens of modules behind ``Ticker.info``.
+That endpoint rejects requests without Yahoo's cookie and crumb, so it is
+called through yfinance's shared session, which already holds them.
+"""
+
+from typing import Dict, List, Optional
+import asyncio
+import logging
+
+import httpx
+from yfinance.data import YfData
+
+from .clock import now_iso
+from .ratelimit import RateLimitExceeded, acquire_async, run_blocking
+from .session import yf_session
+
+logger = logging.getLogger(__name__)
+
+SPARK_URL = "https://query1.finance.yahoo.com/v8/finance/spark"
+SPARK_MAX_SYMBOLS = 20
+QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+
+# Yahoo rejects requests without a browser-like User-Agent
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    ),
+    "Accept": "application/json",
+}
+
+# Connection pool for the shared client; keep-alive connections are
+# multiplexed over HTTP/2, so a small pool covers concurrent batches
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# Shared HTTP client (opened at startup, reused across requests)
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it if it is not open yet."""
+    global _client
+    
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            headers=_HEADERS,
+            limits=_LIMITS,
+            timeout=10.0,
+        )
+    
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release its connections."""
+    global _client
+    
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _quote_from_spark_meta(symbol: str, meta: dict) -> Optional[dict]:
+    """
+    Build a quote dictionary from a spark response ``meta`` block.
+    
+    Args:
+        symbol: Stock ticker symbol
+        meta: The ``response[0].meta`` block for the symbol
+    
+    Returns:
+        Quote data dictionary or None if no price is available
+    """
+    price = meta.get("regularMarketPrice")
+    
+    if not price:
+        return None
+    
+    previous_close = meta.get("previousClose") or meta.get("chartPreviousClose")
+    change = None
+    change_percent = None
+    
+    if previous_close:
+        change = price - previous_close
+        change_percent = change / previous_close * 100
+    
+    return {
+        "symbol": symbol,
+        "price": price,
+        "currency": meta.get("currency"),
+        "change": change,
+        "change_percent": change_percent,
+        "volume": meta.get("regularMarketVolume"),
+        "previous_close": previous_close,
+        "day_high": meta.get("regularMarketDayHigh"),
+        "day_low": meta.get("regularMarketDayLow"),
+        "timestamp": now_iso()
+    }
+
+
+async def _fetch_spark_chunk(symbols: List[str]) -> Dict[str, dict]:
+    """
+    Fetch quotes for up to SPARK_MAX_SYMBOLS symbols in one request.
+    
+    Args:
+        symbols: Stock ticker symbols (at most SPARK_MAX_SYMBOLS)
+    
+    Returns:
+        Mapping of symbol to quote data for the symbols Yahoo returned
+    """
+    await acquire_async()
+    response = await get_http_client().get(
+        SPARK_URL,
+        params={"symbols": ",".join(symbols), "range": "1d", "interval": "1d"},
+    )
+    response.raise_for_status()
+    
+    quotes = {}
+    
+    for result in (response.json().get("spark") or {}).get("result") or []:
+        symbol = result.get("symbol")
+        responses = result.get("response") or []
+        
+        if not symbol or not responses:
+            continue
+        
+        quote = _quote_from_spark_meta(symbol, responses[0].get("meta") or {})
+        
+        if quote:
+            quotes[symbol] = quote
+    
+    return quotes
+
+
+async def fetch_spark_quotes(symbols: List[str]) -> Dict[str, dict]:
+    """
+    Fetch quotes for many symbols using batched spark requests.
+    
+    Symbols are split into chunks of SPARK_MAX_SYMBOLS and the chunks are
+    requested concurrently, each drawing one token from the shared Yahoo
+    rate limit. A failed chunk is logged and skipped, so callers
+    should fall back to per-symbol lookups for anything missing.
+    
+    Args:
+        symbols: Stock ticker symbols
+    
+    Returns:
+        Mapping of symbol to quote data for the symbols that were found
+    
+    Raises:
+        RateLimitExceeded: If a chunk found the rate limit exhausted, in
+            which case per-symbol fallbacks would be refused as well
+    """
+    chunks = [
+        symbols[i:i + SPARK_MAX_SYMBOLS]
+        for i in range(0, len(symbols), SPARK_MAX_SYMBOLS)
+    ]
+    
+    results = await asyncio.gather(
+        *(_fetch_spark_chunk(chunk) for chunk in chunks),
+        return_exceptions=True
+    )
+    
+    for result in results:
+        if isinstance(result, RateLimitExceeded):
+            raise result
+    
+    quotes = {}
+    
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, Exception):
+            logger.warning("Spark request failed for %s: %s", ", ".join(chunk), result)
+            continue
+        
+        quotes.update(result)
+    
+    return quotes
+
+
+def _quote_from_v7_result(result: dict) -> Optional[dict]:
+    """
+    Build a quote dictionary from a v7 quote ``result`` entry.
+    
+    Args:
+        result: One entry of ``quoteResponse.result``
+    
+    Returns:
+        Quote data dictionary or None if no price is available
+    """
+    price = result.get("regularMarketPrice")
+    
+    if not price:
+        return None
+    
+    return {
+        "symbol": result.get("symbol"),
+        "price": price,
+        "currency": result.get("currency"),
+        "change": result.get("regularMarketChange"),
+        "change_percent": result.get("regularMarketChangePercent"),
+        "volume": result.get("regularMarketVolume"),
+        "market_cap": result.get("marketCap"),
+        "previous_close": result.get("regularMarketPreviousClose"),
+        "open": result.get("regularMarketOpen"),
+        "day_high": result.get("regularMarketDayHigh"),
+        "day_low": result.get("regularMarketDayLow"),
+        "timestamp": now_iso()
+    }
+
+
+def _get_v7_quotes(symbols: List[str]) -> dict:
+    """
+    Request the v7 quote endpoint with yfinance's cookie and crumb.
+    
+    This blocks on network I/O, so run it in a worker thread.
+    
+    Args:
+        symbols: Stock ticker symbols
+    
+    Returns:
+        The decoded JSON response
+    """
+    # YfData is yfinance's singleton request helper; it fetches the crumb
+    # once and reuses it for every Ticker using the same session
+    return YfData(session=yf_session).get_raw_json(
+        QUOTE_URL,
+        params={"symbols": ",".join(symbols), "formatted": "false"},
+        timeout=10,
+    )
+
+
+async def fetch_quotes(symbols: List[str]) -> Dict[str, dict]:
+    """
+    Fetch full quotes for symbols from the v7 quote endpoint.
+    
+    A failed request or an unexpected response is logged and yields no
+    quotes, so callers should fall back to yfinance for anything missing.
+    
+    Args:
+        symbols: Stock ticker symbols
+    
+    Returns:
+        Mapping of symbol to quote data for the symbols that were found
+    
+    Raises:
+        RateLimitExceeded: If the rate limit is exhausted, in which case the
+            yfinance fallback would be refused as well
+    """
+    try:
+        payload = await run_blocking(_get_v7_quotes, symbols)
+        results = list((payload.get("quoteResponse") or {}).get("result") or [])
+    except RateLimitExceeded:
+        raise
+    except Exception as e:
+        logger.warning("Quote request failed for %s: %s", ", ".join(symbols), e)
+        return {}
+    
+    quotes = {}
+    
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        
+        quote = _quote_from_v7_result(result)
+        
+        if quote and quote["symbol"]:
+            quotes[quote["symbol"]] = quote
+    
+    return quotes
@@ -185,8 +185,106 @@ def test_historical_data(api_key: str) -> bool:
         print_error(f"Historical data failed: {str(e)}")
         return False
 
+def test_quote_not_modified(api_key: str) -> bool:
+    """Test that a quote request with a current ETag gets 304 Not Modified"""
+    print_header("Test 8: Quote ETag (If-None-Match)")
+    try:
+        headers = {"X-API-Key": api_key}
+        response = requests.get(f"{API_URL}/quote/AAPL", headers=headers, timeout=10)
+        etag = response.headers.get("ETag")
+        
+        if response.status_code != 200 or not etag:
+            print_error(f"Expected 200 with an ETag, got {response.status_code} ({etag})")
+            return False
+        
+        headers["If-None-Match"] = etag
+        response = requests.get(f"{API_URL}/quote/AAPL", headers=headers, timeout=10)
+        
+        if response.status_code == 304 and not response.content:
+            print_success(f"Repeat request with ETag {etag} got 304 Not Modified")
+            return True
+        else:
+            print_error(f"Expected an empty 304, got {response.status_code}")
+            return False
+    except Exception as e:
+        print_error(f"ETag test failed: {str(e)}")
+        return False
+
+def test_invalid_symbol(api_key: str) -> bool:
+    """Test that malformed symbols get an error entry in a multi-quote response"""
+    print_header("Test 9: Invalid Symbol in Multiple Quotes")
+    try:
+        headers = {"X-API-Key": api_key}
+        response = requests.get(
+            f"{API_URL}/quotes",
+            params={"symbols": "AAPL,B@D,M&M.NS"},
+            headers=headers,
+            timeout=10
+        )
+        
+        if response.status_code != 200:
+            print_error(f"Multiple quotes failed with status {response.status_code}")
+            return False
+        
+        quotes = {quote.get('symbol'): quote for quote in response.json().get('quotes', [])}
+        
+        if quotes.get("B@D", {}).get("error") != "Invalid symbol":
+            print_error(f"Expected an 'Invalid symbol' entry for B@D, got {quotes.get('B@D')}")
+            return False
+        
+        if quotes.get("M&M.NS", {}).get("error") == "Invalid symbol":
+            print_error("M&M.NS was rejected as an invalid symbol")
+            return False
+        
+        print_success("B@D got an 'Invalid symbol' entry, M&M.NS was accepted")
+        return True
+    except Exception as e:
+        print_error(f"Invalid symbol test failed: {str(e)}")
+        return False
+
+def test_history_omits_nulls(api_key: str) -> bool:
+    """Test that historical bars omit missing fields instead of sending null"""
+    print_header("Test 10: Historical Data Without Nulls")
+    try:
+        headers = {
+            "X-API-Key": api_key,
+            "Content-Type": "application/json"
+        }
+        # Bars with gaps (e.g. no volume) must omit the field, not send null
+        payload = {
+            "symbol": "^GSPC",
+            "period": "5d",
+            "interval": "1h"
+        }
+        response = requests.post(
+            f"{API_URL}/history",
+            json=payload,
+            headers=headers,
+            timeout=10
+        )
+        
+        if response.status_code != 200:
+            print_error(f"Historical data failed with status {response.status_code}")
+            return False
+        
+        hist_data = response.json().get('data', [])
+        with_nulls = [bar for bar in hist_data if None in bar.values()]
+        
+        if with_nulls:
+            print_error(f"{len(with_nulls)} bars contain nulls, e.g. {with_nulls[0]}")
+            return False
+        
+        without_volume = sum(1 for bar in hist_data if 'volume' not in bar)
+        print_success(f"No nulls in {len(hist_data)} bars ({without_volume} without a volume key)")
+        return True
+    except Exception as e:
+        print_error(f"Historical data test failed: {str(e)}")
+        return False
+
 def main():
     """Main test runner"""
+    global API_KEY
+    
     print_header("Pi Finance API Test Suite")
     print_info(f"API URL: {API_URL}")
     
@@ -206,7 +304,6 @@ def main():
                         if line.startswith("API_KEYS="):
                             key = line.split("=", 1)[1].strip()
                             # Get first key if multiple
-                            global API_KEY
                             API_KEY = key.split(",")[0].strip()
                             print_success(f"Found API key in .env file")
                             break
@@ -234,6 +331,9 @@ def main():
         results.append(("Multiple Quotes", test_multiple_quotes(API_KEY)))
         results.append(("Company Info", test_company_info(API_KEY)))
         results.append(("Historical Data", test_historical_data(API_KEY)))
+        results.append(("Quote ETag", test_quote_not_modified(API_KEY)))
+        results.append(("Invalid Symbol", test_invalid_symbol(API_KEY)))
+        results.append(("History Without Nulls", test_history_omits_nulls(API_KEY)))
     
     # Print summary
     print_header("Test Summary")
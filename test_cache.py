@@ -7,17 +7,127 @@ This script tests:
 2. Cache hit/miss behavior
 3. Background refresh mechanism
 4. Cache management endpoints
+5. Response cache expiry
+6. Stale entry detection
+7. Size bound and eviction
+8. Refresh keeping fields the refresh source lacks
+
+By default it prints a one-line JSON summary (plus the full log if a test
+fails); set VERBOSE=1 for the human-readable log of every test.
 """
 
 import asyncio
+import contextvars
+import functools
+import io
+import json
+import os
+import pathlib
 import sys
 import time
+import traceback
+from unittest import mock
 from datetime import datetime
+from types import MappingProxyType
+
+# Add this file's directory (the project root) to path to import app modules
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+
+# Print every test's log, not just the summary
+VERBOSE = os.environ.get("VERBOSE") == "1"
+
+# app.cache is imported inside the tests, so importing this module
+# (e.g. during test collection) doesn't load the app and its dependencies
+
+# Test payloads, built once for the whole run (the cache copies what it stores)
+_AAPL_PAYLOAD = MappingProxyType({
+    "symbol": "AAPL",
+    "price": 195.50,
+    "currency": "USD",
+    "change": 2.30,
+    "change_percent": 1.19,
+    "timestamp": datetime.now().isoformat()
+})
+_BASE_PAYLOAD = MappingProxyType({"price": 100.0, "currency": "USD"})
+
+
+def _check(condition, message):
+    """Fail the current test with message unless condition holds (unlike assert, kept under -O)."""
+    if not condition:
+        raise AssertionError(message)
+
+
+# Output buffer of the running test, so concurrent tests don't interleave output
+_output = contextvars.ContextVar("_output", default=None)
 
-# Add parent directory to path to import app modules
-sys.path.insert(0, '/Users/mveluscek/Workspace/personal/pi-finance')
 
-from app.cache import PriceCache
+class _TestOutput(io.TextIOBase):
+    """stdout wrapper that writes to the current test's buffer, if it has one."""
+    
+    def __init__(self, stream):
+        self._stream = stream
+    
+    def write(self, text):
+        buffer = _output.get()
+        return (buffer if buffer is not None else self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+
+
+async def _capture(*tests):
+    """
+    Run test coroutine functions one after another, each with its own
+    output buffer; return a (name, output, error) tuple per test.
+    """
+    results = []
+    
+    for test in tests:
+        buffer = io.StringIO()
+        _output.set(buffer)
+        
+        try:
+            await test()
+        except Exception as e:
+            results.append((test.__name__, buffer.getvalue(), e))
+        else:
+            results.append((test.__name__, buffer.getvalue(), None))
+    
+    return results
+
+
+# Settings for the caches built by the tests, unless a test overrides them
+_DEFAULT_CACHE_KWARGS = MappingProxyType({
+    "ttl_days": 7,
+    "refresh_interval_minutes": 30,
+    "enabled": True
+})
+
+
+def _default_cache(**overrides):
+    """Create a new PriceCache with the default test settings, plus any overrides."""
+    from app.cache import PriceCache
+    
+    return PriceCache(**{**_DEFAULT_CACHE_KWARGS, **overrides})
+
+
+@functools.lru_cache()
+def _shared_cache():
+    """
+    Get the cache shared by the tests that don't need special construction,
+    creating it on first use. Each of those tests reconfigures and empties it
+    on entry.
+    """
+    return _default_cache()
+
+
+def _reconfigure(cache, ttl_days=7, refresh_interval_minutes=30):
+    """Reset a cache to an empty state with fresh statistics and the given settings."""
+    cache.ttl_days = ttl_days
+    cache.refresh_interval_minutes = refresh_interval_minutes
+    cache.clear()
+    cache.reset_stats()
+    return cache
 
 
 async def test_cache_basic():
@@ -27,52 +137,50 @@ async def test_cache_basic():
     print("=" * 70)
     
     # Initialize cache
-    cache = PriceCache(
-        ttl_days=7,
-        refresh_interval_minutes=30,
-        enabled=True
-    )
+    cache = _reconfigure(_shared_cache())
     
     # Test cache miss
     print("\n1. Testing cache MISS (symbol not in cache)...")
     result = cache.get("AAPL")
-    assert result is None, "Expected cache miss"
+    _check(result is None, "Expected cache miss")
     print("   ✓ Cache miss works correctly")
     
     # Add data to cache
     print("\n2. Adding AAPL to cache...")
-    test_data = {
-        "symbol": "AAPL",
-        "price": 195.50,
-        "currency": "USD",
-        "change": 2.30,
-        "change_percent": 1.19,
-        "timestamp": datetime.now().isoformat()
-    }
-    cache.set("AAPL", test_data)
+    cache.set("AAPL", _AAPL_PAYLOAD)
     print("   ✓ Data added to cache")
     
     # Test cache hit
     print("\n3. Testing cache HIT (symbol in cache)...")
     result = cache.get("AAPL")
-    assert result is not None, "Expected cache hit"
-    assert result["symbol"] == "AAPL", "Wrong symbol returned"
-    assert result["price"] == 195.50, "Wrong price returned"
+    _check(result is not None, "Expected cache hit")
+    _check(result["symbol"] == "AAPL", "Wrong symbol returned")
+    _check(result["price"] == 195.50, "Wrong price returned")
     print(f"   ✓ Cache hit works correctly: ${result['price']}")
     
     # Test cache stats
     print("\n4. Testing cache statistics...")
     stats = cache.get_stats()
-    print(f"   - Cached symbols: {stats['cached_symbols']}")
-    print(f"   - Total requests: {stats['total_requests']}")
-    print(f"   - Cache hits: {stats['cache_hits']}")
-    print(f"   - Cache misses: {stats['cache_misses']}")
-    print(f"   - Hit rate: {stats['hit_rate_percent']}%")
-    assert stats["cached_symbols"] == 1, "Expected 1 cached symbol"
-    assert stats["cache_hits"] == 1, "Expected 1 cache hit"
-    assert stats["cache_misses"] == 1, "Expected 1 cache miss"
+    print(
+        f"   - Cached symbols: {stats['cached_symbols']}\n"
+        f"   - Total requests: {stats['total_requests']}\n"
+        f"   - Cache hits: {stats['cache_hits']}\n"
+        f"   - Cache misses: {stats['cache_misses']}\n"
+        f"   - Hit rate: {stats['hit_rate_percent']}%"
+    )
+    _check(cache.cached_count == 1, "Expected 1 cached symbol")
+    _check(cache.hits == 1, "Expected 1 cache hit")
+    _check(cache.misses == 1, "Expected 1 cache miss")
     print("   ✓ Statistics work correctly")
     
+    # Test bulk lookup
+    print("\n5. Testing bulk lookup...")
+    hits = cache.get_many(["AAPL", "msft", "aapl"])
+    _check(list(hits) == ["AAPL"], "Expected only AAPL to hit")
+    _check(cache.hits == 2, "Expected 2 cache hits")
+    _check(cache.misses == 2, "Expected 2 cache misses")
+    print("   ✓ Bulk lookup works correctly")
+    
     print("\n✅ All basic cache tests passed!\n")
 
 
@@ -82,42 +190,37 @@ async def test_cache_refresh():
     print("TEST 2: Cache Refresh Mechanism")
     print("=" * 70)
     
-    cache = PriceCache(
-        ttl_days=7,
-        refresh_interval_minutes=30,
-        enabled=True
-    )
+    cache = _reconfigure(_shared_cache())
     
     # Add some test symbols
     print("\n1. Adding test symbols to cache...")
     symbols = ["AAPL", "MSFT", "GOOGL"]
-    for symbol in symbols:
-        cache.set(symbol, {
-            "symbol": symbol,
-            "price": 100.0,
-            "currency": "USD",
-            "timestamp": datetime.now().isoformat()
-        })
+    timestamp = datetime.now().isoformat()
+    # PriceCache is thread-safe; seed it off the event loop so concurrent tests keep running
+    await asyncio.to_thread(cache.set_many, {
+        symbol: {**_BASE_PAYLOAD, "symbol": symbol, "timestamp": timestamp}
+        for symbol in symbols
+    })
     print(f"   ✓ Added {len(symbols)} symbols to cache")
     
     # Get symbols to refresh
     print("\n2. Getting symbols that need refresh...")
     symbols_to_refresh = cache.get_symbols_to_refresh()
     print(f"   ✓ Found {len(symbols_to_refresh)} symbols to refresh: {symbols_to_refresh}")
-    assert len(symbols_to_refresh) == 3, "Expected 3 symbols"
+    _check(len(symbols_to_refresh) == 3, "Expected 3 symbols")
     
     # Test refresh (will actually call Yahoo Finance - this may take a few seconds)
     print("\n3. Testing live refresh (this may take 5-10 seconds)...")
     print("   Note: This fetches real data from Yahoo Finance")
     await cache.refresh_all()
     
-    stats = cache.get_stats()
-    print(f"   ✓ Refresh completed: {stats['total_refreshes']} successful refreshes")
+    print(f"   ✓ Refresh completed: {cache.total_refreshes} successful refreshes")
     
     # Verify refreshed data
     print("\n4. Verifying refreshed data...")
+    results = cache.get_many(symbols)
     for symbol in symbols:
-        data = cache.get(symbol)
+        data = results.get(symbol)
         if data and data.get("price"):
             print(f"   - {symbol}: ${data['price']:.2f}")
         else:
@@ -132,28 +235,49 @@ async def test_ttl_and_cleanup():
     print("TEST 3: TTL and Cleanup")
     print("=" * 70)
     
-    # Create cache with very short TTL for testing
-    cache = PriceCache(
-        ttl_days=0,  # Expire immediately
-        refresh_interval_minutes=30,
-        enabled=True
-    )
+    cache = _reconfigure(_shared_cache())
     
-    print("\n1. Adding symbol with 0-day TTL (expires immediately)...")
-    cache.set("TEST", {
-        "symbol": "TEST",
-        "price": 1.0,
-        "timestamp": datetime.now().isoformat()
-    })
-    print("   ✓ Symbol added")
+    # Use a very short TTL for testing, only for this block
+    with cache.override(ttl_days=0):  # Expire immediately
+        print("\n1. Adding symbol with 0-day TTL (expires immediately)...")
+        cache.set("TEST", {
+            "symbol": "TEST",
+            "price": 1.0,
+            "timestamp": datetime.now().isoformat()
+        })
+        print("   ✓ Symbol added")
+        
+        # Symbols should be cleaned up when we check for refresh
+        print("\n2. Checking for expired symbols...")
+        symbols_to_refresh = cache.get_symbols_to_refresh()
+        print(f"   ✓ Found {len(symbols_to_refresh)} symbols (expired ones removed)")
+        
+        print(f"   - Cached symbols after cleanup: {cache.cached_count}")
     
-    # Symbols should be cleaned up when we check for refresh
-    print("\n2. Checking for expired symbols...")
-    symbols_to_refresh = cache.get_symbols_to_refresh()
-    print(f"   ✓ Found {len(symbols_to_refresh)} symbols (expired ones removed)")
+    _check(cache.ttl_days == 7, "Expected the default TTL to be restored")
     
-    stats = cache.get_stats()
-    print(f"   - Cached symbols after cleanup: {stats['cached_symbols']}")
+    # With nothing close to expiring, repeat checks skip the cleanup sweep
+    print("\n3. Checking again with a 7-day TTL...")
+    cache.set("TEST", {"symbol": "TEST", "price": 1.0})
+    
+    for _ in range(2):
+        symbols_to_refresh = cache.get_symbols_to_refresh()
+        _check(symbols_to_refresh == ["TEST"], "Unexpired symbol should be kept")
+    
+    print(f"   ✓ Found {len(symbols_to_refresh)} symbols, none expired")
+    
+    # The cache keeps time as monotonic nanoseconds; fake the clock 8 days ahead
+    print("\n4. Checking 8 days later (fake monotonic clock)...")
+    import app.cache
+    
+    offset_ns = 8 * app.cache.NS_PER_DAY
+    
+    with mock.patch.object(cache, "_clock", lambda: time.monotonic_ns() + offset_ns):
+        symbols_to_refresh = cache.get_symbols_to_refresh()
+    
+    _check(symbols_to_refresh == [], "Expected the symbol to expire")
+    _check(cache.cached_count == 0, "Expected the expired symbol to be removed")
+    print("   ✓ Symbol expired after the TTL")
     
     print("\n✅ TTL and cleanup test passed!\n")
 
@@ -164,66 +288,318 @@ async def test_cache_management():
     print("TEST 4: Cache Management")
     print("=" * 70)
     
-    cache = PriceCache(
-        ttl_days=7,
-        refresh_interval_minutes=30,
-        enabled=True
-    )
+    cache = _reconfigure(_shared_cache())
     
     # Add test data
     print("\n1. Adding test data...")
     symbols = ["AAPL", "MSFT", "GOOGL", "TSLA"]
-    for symbol in symbols:
-        cache.set(symbol, {"symbol": symbol, "price": 100.0})
+    cache.set_many({symbol: {**_BASE_PAYLOAD, "symbol": symbol} for symbol in symbols})
     print(f"   ✓ Added {len(symbols)} symbols")
     
     # Test symbol info
     print("\n2. Getting symbol info...")
     info = cache.get_symbol_info("AAPL")
-    print(f"   - Symbol: {info['symbol']}")
-    print(f"   - Cached: {info['cached']}")
-    print(f"   - Last refreshed: {info['last_refreshed']}")
+    print(
+        f"   - Symbol: {info['symbol']}\n"
+        f"   - Cached: {info['cached']}\n"
+        f"   - Last refreshed: {info['last_refreshed']}"
+    )
     print("   ✓ Symbol info retrieved")
     
     # Test remove symbol
     print("\n3. Removing TSLA from cache...")
     removed = cache.remove_symbol("TSLA")
-    assert removed == True, "Expected symbol to be removed"
+    _check(removed is True, "Expected symbol to be removed")
     print("   ✓ Symbol removed")
     
-    stats = cache.get_stats()
-    print(f"   - Cached symbols after removal: {stats['cached_symbols']}")
-    assert stats["cached_symbols"] == 3, "Expected 3 symbols after removal"
+    print(f"   - Cached symbols after removal: {cache.cached_count}")
+    _check(cache.cached_count == 3, "Expected 3 symbols after removal")
     
     # Test clear cache
     print("\n4. Clearing entire cache...")
     count = cache.clear()
     print(f"   ✓ Cleared {count} symbols")
     
-    stats = cache.get_stats()
-    assert stats["cached_symbols"] == 0, "Expected 0 symbols after clear"
-    print(f"   - Cached symbols after clear: {stats['cached_symbols']}")
+    _check(cache.cached_count == 0, "Expected 0 symbols after clear")
+    print(f"   - Cached symbols after clear: {cache.cached_count}")
     
     print("\n✅ Cache management test passed!\n")
 
 
+async def test_response_cache():
+    """Test the TTL-based response cache used for company info and dividends."""
+    print("=" * 70)
+    print("TEST 5: Response Cache")
+    print("=" * 70)
+    
+    from app.cache import ResponseCache
+    
+    cache = ResponseCache(ttl_seconds=3600, enabled=True)
+    
+    print("\n1. Testing cache miss and hit...")
+    _check(cache.get("AAPL") is None, "Expected cache miss")
+    cache.set("AAPL", {"symbol": "AAPL", "name": "Apple Inc."})
+    result = cache.get("AAPL")
+    _check(result is not None, "Expected cache hit")
+    _check(result["name"] == "Apple Inc.", "Wrong data returned")
+    print("   ✓ Cache miss and hit work correctly")
+    
+    print("\n2. Testing expiry...")
+    expired = ResponseCache(ttl_seconds=0, enabled=True)
+    expired.set("AAPL", {"symbol": "AAPL"})
+    _check(expired.get("AAPL") is None, "Expected expired entry to be dropped")
+    print("   ✓ Expired entries are dropped")
+    
+    print("\n3. Testing clear...")
+    count = cache.clear()
+    _check(count == 1, "Expected 1 entry cleared")
+    _check(cache.get("AAPL") is None, "Expected cache miss after clear")
+    print(f"   ✓ Cleared {count} entries")
+    
+    print("\n✅ Response cache test passed!\n")
+
+
+async def test_staleness():
+    """Test detection of entries that have outlived the refresh interval."""
+    print("=" * 70)
+    print("TEST 6: Stale Entry Detection")
+    print("=" * 70)
+    
+    cache = _default_cache()
+    
+    print("\n1. Testing fresh entry...")
+    cache.set("AAPL", {**_BASE_PAYLOAD, "symbol": "AAPL"})
+    data, stale = cache.get_with_staleness("AAPL")
+    _check(data is not None, "Expected cache hit")
+    _check(not stale, "Expected fresh entry")
+    print("   ✓ Freshly cached entry is not stale")
+    
+    print("\n2. Testing stale entry (0-minute refresh interval)...")
+    stale_cache = _default_cache(refresh_interval_minutes=0)  # Stale immediately
+    stale_cache.set("AAPL", {**_BASE_PAYLOAD, "symbol": "AAPL"})
+    data, stale = stale_cache.get_with_staleness("AAPL")
+    _check(data is not None, "Expected stale data to still be served")
+    _check(stale, "Expected stale entry")
+    print("   ✓ Stale entry is served and flagged")
+    
+    print("\n3. Testing miss...")
+    data, stale = cache.get_with_staleness("MSFT")
+    _check(data is None and not stale, "Expected plain cache miss")
+    print("   ✓ Cache miss is never stale")
+    
+    print("\n4. Testing backoff after a failed background refresh...")
+    attempts = []
+    
+    async def failing_refresh(symbols, semaphore):
+        attempts.append(symbols)
+        return []
+    
+    stale_cache._refresh_chunk = failing_refresh
+    
+    for _ in range(10):
+        stale_cache.revalidate("AAPL")
+        await asyncio.sleep(0)
+    
+    _check(len(attempts) == 1, "Expected one upstream attempt while backing off")
+    print("   ✓ 10 stale requests made 1 refresh attempt")
+    
+    print("\n5. Testing batched background refresh...")
+    from app.cache import SPARK_MAX_SYMBOLS
+    
+    attempts.clear()
+    symbols = ["AAPL"] + [f"S{i}" for i in range(50)]
+    stale_cache.revalidate_many(symbols)
+    await asyncio.sleep(0)
+    
+    _check(
+        [len(chunk) for chunk in attempts] == [SPARK_MAX_SYMBOLS, SPARK_MAX_SYMBOLS, 10],
+        "Expected 50 symbols in spark-sized chunks, skipping the one backing off"
+    )
+    print(f"   ✓ 50 stale symbols made {len(attempts)} refresh attempts")
+    
+    print("\n✅ Stale entry detection test passed!\n")
+
+
+async def test_size_bound():
+    """Test least-recently-requested eviction when the cache is full."""
+    print("=" * 70)
+    print("TEST 7: Size Bound and Eviction")
+    print("=" * 70)
+    
+    from app.cache import NUM_SHARDS
+    
+    # One ticker per shard
+    cache = _default_cache(max_symbols=NUM_SHARDS)
+    removed = []
+    cache.add_removal_listener(removed.extend)
+    
+    # Find symbols that land in the same shard
+    print("\n1. Filling a shard...")
+    shard = hash("AAPL") % NUM_SHARDS
+    same_shard = [f"T{i}" for i in range(1000) if hash(f"T{i}") % NUM_SHARDS == shard][:5]
+    symbols = same_shard[:2]
+    cache.set(symbols[0], {"symbol": symbols[0], "price": 1.0})
+    print(f"   ✓ Cached {symbols[0]}")
+    
+    print("\n2. Adding another ticker to the full shard...")
+    cache.set(symbols[1], {"symbol": symbols[1], "price": 2.0})
+    _check(cache.get(symbols[0]) is None, "Expected oldest ticker to be evicted")
+    _check(cache.get(symbols[1]) is not None, "Expected new ticker to be cached")
+    _check(cache.evictions == 1, "Expected 1 eviction")
+    _check(removed == [symbols[0]], "Expected removal listeners to be told about the eviction")
+    print(f"   ✓ {symbols[0]} evicted, {symbols[1]} cached")
+    
+    print("\n3. Testing unbounded cache...")
+    unbounded = _default_cache()
+    for symbol in symbols:
+        unbounded.set(symbol, {"symbol": symbol, "price": 1.0})
+    _check(unbounded.cached_count == 2, "Expected no eviction")
+    print("   ✓ No eviction without a limit")
+    
+    print("\n4. Testing preallocated metadata...")
+    from app.cache import initialize_cache
+    
+    sized = initialize_cache(max_symbols=1000, initial_capacity=1000)
+    _check(len(sized._last_req) == 1000, "Expected 1000-slot request time array")
+    _check(len(sized._last_ref) == 1000, "Expected 1000-slot refresh time array")
+    print("   ✓ Metadata arrays start with 1000 slots")
+    
+    print("\n5. Refreshing tickers that were only requested...")
+    import app.cache
+    
+    async def fetch_all(symbols):
+        return {symbol: {"symbol": symbol, "price": 3.0} for symbol in symbols}
+    
+    refreshed = _default_cache(max_symbols=NUM_SHARDS)
+    refreshed.set(same_shard[0], {"symbol": same_shard[0], "price": 1.0})
+    for symbol in same_shard[1:]:
+        refreshed.get(symbol)  # Misses, tracked for refresh
+    
+    with mock.patch.object(app.cache, "fetch_spark_quotes", fetch_all):
+        await refreshed.refresh_all()
+    
+    _check(refreshed.cached_count == 1, "Expected the refresh to respect the size bound")
+    _check(refreshed.get(same_shard[-1]) is not None, "Expected the latest requested ticker to be kept")
+    print(f"   ✓ Shard still holds 1 ticker ({same_shard[-1]})")
+    
+    print("\n✅ Size bound test passed!\n")
+
+
+async def test_refresh_keeps_fields():
+    """Test that a spark refresh keeps the fields spark does not supply."""
+    print("=" * 70)
+    print("TEST 8: Refresh Keeps Unrefreshed Fields")
+    print("=" * 70)
+    
+    import app.cache
+    import app.yahoo
+    
+    cache = _default_cache()
+    
+    print("\n1. Caching a full quote...")
+    cache.set("AAPL", {
+        **_AAPL_PAYLOAD,
+        "volume": 1000,
+        "market_cap": 3.0e12,
+        "previous_close": 193.2,
+        "open": 194.0,
+        "day_high": 196.0,
+        "day_low": 193.0
+    })
+    print("   ✓ Cached AAPL with market cap and open")
+    
+    print("\n2. Refreshing from a spark response...")
+    # Shape of a real spark response[0].meta block (no market cap or open)
+    meta = {
+        "currency": "USD",
+        "symbol": "AAPL",
+        "exchangeName": "NMS",
+        "instrumentType": "EQUITY",
+        "regularMarketTime": 1760472000,
+        "regularMarketPrice": 201.0,
+        "regularMarketDayHigh": 202.5,
+        "regularMarketDayLow": 198.5,
+        "regularMarketVolume": 52000000,
+        "chartPreviousClose": 199.0,
+        "previousClose": 199.0
+    }
+    
+    async def fetch_spark(symbols):
+        return {symbol: app.yahoo._quote_from_spark_meta(symbol, meta) for symbol in symbols}
+    
+    with mock.patch.object(app.cache, "fetch_spark_quotes", fetch_spark):
+        await cache.refresh_all()
+    
+    data = cache.get("AAPL")
+    _check(data["price"] == 201.0, "Expected the refreshed price")
+    _check(data["day_high"] == 202.5, "Expected the refreshed day high")
+    _check(data["market_cap"] == 3.0e12, "Expected market cap to survive the refresh")
+    _check(data["open"] == 194.0, "Expected open to survive the refresh")
+    print("   ✓ Price refreshed, market cap and open kept")
+    
+    print("\n✅ Refresh field merge test passed!\n")
+
+
 async def main():
-    """Run all tests."""
+    """
+    Run all tests and print a JSON summary; returns the exit code.
+    
+    Test output is buffered and written to stdout once at the end, and only
+    when VERBOSE is set or a test failed.
+    """
+    stdout = sys.stdout
+    output = io.StringIO()
+    sys.stdout = _TestOutput(output)
+    
+    try:
+        summary = await _run_tests()
+    except Exception:
+        sys.stdout = stdout
+        stdout.write(output.getvalue())
+        raise
+    finally:
+        sys.stdout = stdout
+    
+    if VERBOSE or summary["failed"]:
+        stdout.write(output.getvalue())
+    
+    stdout.write(json.dumps(summary) + "\n")
+    stdout.flush()
+    
+    return 1 if summary["failed"] else 0
+
+
+async def _run_tests():
+    """Run all tests, printing their logs and a summary; returns the summary."""
     print("\n" + "=" * 70)
     print("Pi Finance API - Cache Testing Suite")
     print("=" * 70 + "\n")
     
-    try:
-        # Run tests
-        await test_cache_basic()
-        await test_ttl_and_cleanup()
-        await test_cache_management()
-        
-        # Optional: Run refresh test (takes longer)
-        print("\nℹ️  Live refresh test skipped (takes 5-10 seconds)")
-        print("   To run it, uncomment the line in test_cache.py\n")
-        # await test_cache_refresh()
+    # Run tests concurrently; tests on the shared cache run in sequence.
+    # Each test's output is buffered and printed in order afterwards.
+    groups = await asyncio.gather(
+        _capture(test_cache_basic, test_ttl_and_cleanup, test_cache_management),
+        _capture(test_response_cache),
+        _capture(test_staleness),
+        _capture(test_size_bound),
+        _capture(test_refresh_keeps_fields)
+    )
+    results = [result for group in groups for result in group]
+    failed = {}
+    
+    for name, output, error in results:
+        print(output, end="")
         
+        if error is not None:
+            print(f"\n❌ TEST FAILED: {name}: {error}")
+            traceback.print_exception(error, file=sys.stdout)
+            failed[name] = str(error)
+    
+    # Optional: Run refresh test (takes longer)
+    print("\nℹ️  Live refresh test skipped (takes 5-10 seconds)")
+    print("   To run it, add it to the tests run in _run_tests()\n")
+    
+    if not failed:
         print("=" * 70)
         print("✅ ALL TESTS PASSED!")
         print("=" * 70)
@@ -233,14 +609,13 @@ async def main():
         print("2. Check cache stats: curl -H 'X-API-Key: your-key' http://localhost:8000/cache/stats")
         print("3. Test in Google Sheets with your custom functions")
         print()
-        
-    except Exception as e:
-        print(f"\n❌ TEST FAILED: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return 1
     
-    return 0
+    return {
+        "tests": len(results),
+        "passed": len(results) - len(failed),
+        "failed": failed,
+        "skipped": [test_cache_refresh.__name__]
+    }
 
 
 if __name__ == "__main__":